@@ -11,15 +11,19 @@ load_dotenv()
 db = SQLAlchemy()
 migrate = Migrate()
 
-def create_app():
+def include_object(obj, name, type_, reflected, compare_to):
+    # The SQLite R*Tree (and its shadow tables) are created by migration, not by models
+    return not (type_ == "table" and name.startswith("surf_spot_rtree"))
+
+def create_app(config_object=None):
     app = Flask(__name__)
 
-    # Load configuration
-    app.config.from_object("app.config.Config")
+    # Load configuration (APP_CONFIG=app.config.ProductionConfig under gunicorn)
+    app.config.from_object(config_object or os.getenv("APP_CONFIG", "app.config.Config"))
 
     # Initialize extensions
     db.init_app(app)
-    migrate.init_app(app, db)
+    migrate.init_app(app, db, include_object=include_object)
 
     # Import models here to make sure Alembic is aware of them
     from app import models
@@ -28,5 +32,17 @@ def create_app():
     from app.routes import bp
     app.register_blueprint(bp)
 
+    # CLI: flask import-spots
+    from app.commands import import_spots
+    app.cli.add_command(import_spots)
+
+    # In-memory nearest-spot index, rebuilt whenever surf_spot rows change
+    from app.spatial import spot_index
+    spot_index.init_app(app)
+
+    # Location responses cached per quantized lat/lon cell
+    from app.geo_cache import geo_cache
+    geo_cache.init_app(app)
+
     return app
 
@@ -0,0 +1,98 @@
+import csv
+import os
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import db
+from app.models import SurfSpot
+from app.spatial import bump_catalogue_version, spot_index
+
+DEFAULT_SPOTS_CSV = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "assets", "Surf Spots.csv"
+)
+IMPORT_BATCH = 1000  # rows per executemany
+
+# CSV header -> SurfSpot column
+CSV_COLUMNS = {
+    "Name": "name",
+    "Latitude": "latitude",
+    "Longitude": "longitude",
+    "Direction": "direction",
+    "Type": "type",
+    "Experience": "experience",
+}
+
+
+def read_spots(path):
+    """Yield SurfSpot column dicts from the spots CSV, one row at a time."""
+    # utf-8-sig drops the BOM the spreadsheet export puts before "Name"
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        missing = set(CSV_COLUMNS) - set(reader.fieldnames or [])
+        if missing:
+            raise click.ClickException(f"{path} is missing columns: {', '.join(sorted(missing))}")
+        for line, row in enumerate(reader, start=2):
+            spot = {column: (row[header] or "").strip() for header, column in CSV_COLUMNS.items()}
+            try:
+                spot["latitude"] = float(spot["latitude"])
+                spot["longitude"] = float(spot["longitude"])
+            except ValueError:
+                raise click.ClickException(f"{path}:{line}: latitude/longitude must be numbers")
+            if not spot["name"] or not -90 <= spot["latitude"] <= 90 or not -180 <= spot["longitude"] <= 180:
+                raise click.ClickException(f"{path}:{line}: needs a name and valid coordinates")
+            yield spot
+
+
+def _upsert_statement():
+    dialect = db.engine.dialect.name
+    if dialect == "postgresql":
+        insert = postgresql.insert
+    elif dialect == "sqlite":
+        insert = sqlite.insert
+    else:
+        raise click.ClickException(f"import-spots does not support {dialect}")
+    stmt = insert(SurfSpot.__table__)
+    updated = {c: stmt.excluded[c] for c in CSV_COLUMNS.values() if c != "name"}
+    return stmt.on_conflict_do_update(index_elements=["name"], set_=updated)
+
+
+def upsert_spots(spots, batch=IMPORT_BATCH):
+    """
+    Insert or update (by name) every spot in one transaction, `batch`
+    rows per executemany. Returns the number of rows sent.
+    """
+    stmt = _upsert_statement()
+    count = 0
+    chunk = {}
+    try:
+        for spot in spots:
+            # ON CONFLICT cannot touch one row twice per statement: last row wins
+            chunk[spot["name"]] = spot
+            if len(chunk) >= batch:
+                db.session.execute(stmt, list(chunk.values()))
+                count += len(chunk)
+                chunk = {}
+        if chunk:
+            db.session.execute(stmt, list(chunk.values()))
+            count += len(chunk)
+        db.session.execute(bump_catalogue_version())
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    # Core upserts skip the ORM events SpotIndex listens to; other workers
+    # pick the change up from the catalogue version
+    spot_index.invalidate()
+    return count
+
+
+@click.command("import-spots")
+@click.argument("path", default=DEFAULT_SPOTS_CSV, type=click.Path(exists=True, dir_okay=False))
+@click.option("--batch", default=IMPORT_BATCH, show_default=True, help="Rows per executemany.")
+@with_appcontext
+def import_spots(path, batch):
+    """Upsert surf spots from a CSV (default: assets/Surf Spots.csv)."""
+    count = upsert_spots(read_spots(path), batch=batch)
+    click.echo(f"Upserted {count} surf spots from {os.path.normpath(path)}")
@@ -4,3 +4,34 @@ class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "dev_secret_key")
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Nearest-spot lookups: "memory" (app/spatial.py SpotIndex) or "database"
+    # (spatial index from migration c3d9a1e5f2b7, queried per request)
+    SPATIAL_BACKEND = os.getenv("SPATIAL_BACKEND", "memory")
+    # How often each worker checks spot_catalogue_version for writes made elsewhere
+    SPOT_CATALOGUE_CHECK_SECONDS = float(os.getenv("SPOT_CATALOGUE_CHECK_SECONDS", 5))
+    # Location endpoints answer per lat/lon cell of GEO_CACHE_PRECISION decimals
+    # (3 -> ~110 m; distances are from the cell point, see X-Cache-Cell);
+    # GEO_CACHE_SIZE=0 disables the cache and answers for the exact location.
+    # GEO_CACHE_TTL is also the Cache-Control max-age
+    GEO_CACHE_PRECISION = int(os.getenv("GEO_CACHE_PRECISION", 3))
+    GEO_CACHE_SIZE = int(os.getenv("GEO_CACHE_SIZE", 4096))
+    GEO_CACHE_TTL = int(os.getenv("GEO_CACHE_TTL", 60))
+    # Where the SWAN pipelines publish <spot>/<spot>_forecast.json.gz
+    FORECAST_DIR = os.getenv(
+        "FORECAST_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "surfspots")
+    )
+    # SQLite run store shared with the pipelines (surfspots/forecast_store.py)
+    FORECAST_STORE = os.getenv("FORECAST_STORE", os.path.join(FORECAST_DIR, "forecast_runs.db"))
+
+
+class ProductionConfig(Config):
+    """Settings for gunicorn (see gunicorn.conf.py); select with APP_CONFIG."""
+    DEBUG = False
+    # Per worker process: each gunicorn worker has its own pool
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 5)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 5)),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", 10)),
+        "pool_pre_ping": True,  # drop connections the server closed while idle
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),  # below typical server/proxy idle limits
+    }
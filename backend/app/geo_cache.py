@@ -0,0 +1,140 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, make_response, request
+
+from app.spatial import spot_index
+
+
+def quantize(lat, lon, precision):
+    """Snap a location to its cell: `precision` decimal places (3 -> ~110 m)."""
+    return round(lat, precision), round(lon, precision)
+
+
+class GeoCache:
+    """
+    Thread-safe LRU of location responses with a TTL, keyed by endpoint,
+    quantized coordinates and the remaining query arguments. Views answer
+    for the cell's point, so every caller in a cell gets the same body and
+    a repeat costs a dictionary lookup.
+    """
+
+    def __init__(self, max_entries=4096, ttl=60, precision=3):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.precision = precision
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_entries = app.config.get("GEO_CACHE_SIZE", self.max_entries)
+        self.ttl = app.config.get("GEO_CACHE_TTL", self.ttl)
+        self.precision = app.config.get("GEO_CACHE_PRECISION", self.precision)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+geo_cache = GeoCache()
+
+
+def _finite(value):
+    # "nan" and "inf" parse as floats but are not locations
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(value)
+    return number
+
+
+def location_args(lat_param, lon_param):
+    """
+    (lat, lon) from the query string, or None for missing values. Snapped
+    to the cache cell while geo_cache is enabled, so a cached answer is
+    right for everyone in the cell; exact when GEO_CACHE_SIZE is 0.
+    """
+    lat = request.args.get(lat_param, type=_finite)
+    lon = request.args.get(lon_param, type=_finite)
+    if lat is None or lon is None or not geo_cache.enabled:
+        return lat, lon
+    return quantize(lat, lon, geo_cache.precision)
+
+
+def _generation():
+    # A rebuilt spot index makes every cached answer obsolete
+    if current_app.config.get("SPATIAL_BACKEND") == "database":
+        return None
+    spot_index.ensure()
+    return spot_index.version
+
+
+def geo_cached(lat_param, lon_param):
+    """
+    Cache a GET location view's 200 responses in geo_cache and mark them
+    cacheable for GEO_CACHE_TTL seconds so proxies can keep them too.
+    The view must read its coordinates with location_args(). Cached
+    responses are computed for the cell point (distances, radius and
+    ties; up to ~80 m off at precision 3), sent as X-Cache-Cell "lat,lon"
+    next to X-Cache. With the cache disabled the view runs on the exact
+    coordinates and neither header is sent.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            lat, lon = location_args(lat_param, lon_param)
+            if lat is None or lon is None or not geo_cache.enabled:
+                return view(*args, **kwargs)
+            others = tuple(sorted((k, v) for k, v in request.args.items(multi=True) if k not in (lat_param, lon_param)))
+            key = (request.endpoint, lat, lon, others, _generation())
+
+            cached = geo_cache.get(key)
+            if cached is None:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                cached = response.get_data()
+                geo_cache.put(key, cached)
+                state = "MISS"
+            else:
+                state = "HIT"
+
+            response = make_response(cached)
+            response.headers["Content-Type"] = "application/json"
+            response.headers["Cache-Control"] = f"public, max-age={int(geo_cache.ttl)}"
+            response.headers["X-Cache"] = state
+            response.headers["X-Cache-Cell"] = f"{lat},{lon}"
+            return response
+        return wrapper
+    return decorator
@@ -1,6 +1,9 @@
 from app import db
 
 class SurfSpot(db.Model):
+    # Spots are upserted by name (flask import-spots)
+    __table_args__ = (db.Index("uq_surf_spot_name", "name", unique=True),)
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     direction = db.Column(db.String(100), nullable=False)
@@ -9,3 +12,55 @@ class SurfSpot(db.Model):
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
 
+
+class SpotCatalogueVersion(db.Model):
+    # Single row (id=1) bumped on every surf_spot write; workers compare it
+    # with the version their in-memory spot index was built from
+    __tablename__ = "spot_catalogue_version"
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=1)
+
+class ForecastPoint(db.Model):
+    # One SWAN forecast step for a spot, written by the pipelines' 05_read_forecast.py.
+    # Times are UTC; cycle_time is the first step of the run it came from.
+    __tablename__ = "forecast_point"
+    __table_args__ = (
+        db.Index("ix_forecast_point_spot_cycle_valid", "spot_id", "cycle_time", "valid_time", unique=True),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    spot_id = db.Column(db.Integer, db.ForeignKey("surf_spot.id", ondelete="CASCADE"), nullable=False)
+    cycle_time = db.Column(db.DateTime, nullable=False)
+    valid_time = db.Column(db.DateTime, nullable=False)
+    run_id = db.Column(db.String(64))
+    surf_ft = db.Column(db.Float)
+    quality = db.Column(db.String(20))
+    dir = db.Column(db.Float)
+    tp = db.Column(db.Float)
+    deep_hs = db.Column(db.Float)
+
+    spot = db.relationship("SurfSpot", backref=db.backref("forecast_points", lazy="dynamic", passive_deletes=True))
+
+class SpotConditions(db.Model):
+    # Per-spot summary of the latest cycle, rewritten with every forecast_point
+    # publish, so /surf-spots/conditions never filters forecast rows by time.
+    # now_* is the step in force at publish time; peak_* the biggest daylight
+    # step in the following NEXT_PEAK_HOURS (surfspots/forecast_db.py). UTC.
+    __tablename__ = "spot_conditions"
+
+    spot_id = db.Column(db.Integer, db.ForeignKey("surf_spot.id", ondelete="CASCADE"), primary_key=True)
+    run_id = db.Column(db.String(64))
+    cycle_time = db.Column(db.DateTime, nullable=False)
+    refreshed_at = db.Column(db.DateTime, nullable=False)
+    now_time = db.Column(db.DateTime, nullable=False)
+    now_surf_ft = db.Column(db.Float)
+    now_quality = db.Column(db.String(20))
+    now_dir = db.Column(db.Float)
+    now_tp = db.Column(db.Float)
+    peak_time = db.Column(db.DateTime)
+    peak_surf_ft = db.Column(db.Float)
+    peak_quality = db.Column(db.String(20))
+    peak_tp = db.Column(db.Float)
+
+    spot = db.relationship("SurfSpot", backref=db.backref("conditions", uselist=False, passive_deletes=True))
@@ -1,7 +1,14 @@
-from flask import Blueprint, jsonify, request
-from app.models import SurfSpot
+from flask import Blueprint, current_app, jsonify, make_response, request
+from app.models import ForecastPoint, SpotConditions, SurfSpot
 from app import db
+from app.geo_cache import geo_cache, geo_cached, location_args
+from app.spatial import nearest_in_db, spot_index
+from app.surfspots.forecast_bundle import decode_bundle, read_bundle, read_meta
+from datetime import datetime, timedelta, timezone
+import json
 import math
+import os
+import sqlite3
 
 bp = Blueprint("main", __name__)
 
@@ -28,35 +35,337 @@ def haversine(lat1, lon1, lat2, lon2):
 
 # Route to find the closest surf spot
 @bp.route("/closest-surf-spot", methods=["GET"])
+@geo_cached("latitude", "longitude")
 def closest_surf_spot():
-    # Get current location of user from query parameters
-    user_lat = request.args.get("latitude", type=float)
-    user_lon = request.args.get("longitude", type=float)
+    # Get current location of user from query parameters, snapped to the cache cell
+    # (X-Cache-Cell) unless the geo cache is disabled
+    user_lat, user_lon = location_args("latitude", "longitude")
 
     if user_lat is None or user_lon is None:
         return jsonify({"error": "Please provide latitude and longitude"}), 400
 
-    # Fetch all surf spots from the database
-    surf_spots = SurfSpot.query.all()
-
-    closest_spot = None
-    min_distance = float("inf")  # Start with a very large value for distance
-
-    # Calculate the distance to each surf spot using the Haversine formula
-    for spot in surf_spots:
-        # Latitude and longitude are stored as separate columns in the database
-        distance = haversine(user_lat, user_lon, float(spot.latitude), float(spot.longitude))
-
-        if distance < min_distance:
-            min_distance = distance
-            closest_spot = spot
+    # Answered from the in-memory spot index, or by the database's spatial index
+    if current_app.config["SPATIAL_BACKEND"] == "database":
+        nearest = nearest_in_db(user_lat, user_lon, k=1)
+    else:
+        nearest = spot_index.nearest(user_lat, user_lon, k=1)
 
-    if closest_spot:
+    if nearest:
+        closest_spot, min_distance = nearest[0]
         return jsonify({
-            "name": closest_spot.name,
-            "latitude": closest_spot.latitude,
-            "longitude": closest_spot.longitude,
+            "name": closest_spot["name"],
+            "latitude": closest_spot["latitude"],
+            "longitude": closest_spot["longitude"],
             "distance_km": min_distance
         })
     else:
-        return jsonify({"error": "No surf spots found"}), 404
\ No newline at end of file
+        return jsonify({"error": "No surf spots found"}), 404
+
+CLOSEST_BATCH_MAX = 50000
+
+# Closest surf spot for many locations in one request, e.g. for bulk notifications
+@bp.route("/closest-surf-spot/batch", methods=["POST"])
+def closest_surf_spot_batch():
+    body = request.get_json(silent=True)
+    # {"locations": [...]} or the bare list
+    locations = body.get("locations") if isinstance(body, dict) else body
+    if not isinstance(locations, list) or not locations:
+        return jsonify({"error": "Please provide a non-empty locations list"}), 400
+    if len(locations) > CLOSEST_BATCH_MAX:
+        return jsonify({"error": f"At most {CLOSEST_BATCH_MAX} locations per request"}), 413
+
+    try:
+        lats = [float(loc["latitude"]) for loc in locations]
+        lons = [float(loc["longitude"]) for loc in locations]
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "Every location needs numeric latitude and longitude"}), 400
+    # NaN or infinity would come back as distances JSON cannot carry
+    if not all(map(math.isfinite, lats + lons)):
+        return jsonify({"error": "Every location needs numeric latitude and longitude"}), 400
+
+    spots, idx, distances = spot_index.nearest_many(lats, lons)
+    if not spots:
+        return jsonify({"error": "No surf spots found"}), 404
+
+    return jsonify({
+        "results": [
+            {
+                "name": spots[i]["name"],
+                "latitude": spots[i]["latitude"],
+                "longitude": spots[i]["longitude"],
+                "distance_km": d,
+            }
+            for i, d in zip(idx.tolist(), distances.tolist())
+        ],
+    })
+
+# Every surf spot, served from the in-memory catalogue
+@bp.route("/surf-spots", methods=["GET"])
+def list_surf_spots():
+    spots = spot_index.spots
+    response = make_response(jsonify({"spots": spots}))
+    # Changes only when a write bumps spot_catalogue_version; without that
+    # row (not migrated, or unreadable) the body itself is hashed
+    if spot_index.catalogue_version is None:
+        response.add_etag()
+    else:
+        response.set_etag(f"spots-{spot_index.catalogue_version}-{len(spots)}")
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
+
+NEARBY_PER_PAGE = 20
+NEARBY_MAX_PER_PAGE = 100
+
+# k nearest spots, optionally within a radius and filtered on experience/type
+@bp.route("/surf-spots/nearby", methods=["GET"])
+@geo_cached("lat", "lon")
+def nearby_surf_spots():
+    lat, lon = location_args("lat", "lon")
+    k = request.args.get("k", type=int)
+    radius_km = request.args.get("radius_km", type=float)
+    page = request.args.get("page", 1, type=int)
+    per_page = request.args.get("per_page", NEARBY_PER_PAGE, type=int)
+
+    if lat is None or lon is None:
+        return jsonify({"error": "Please provide lat and lon"}), 400
+    if k is not None and k < 1:
+        return jsonify({"error": "k must be a positive integer"}), 400
+    if radius_km is not None and radius_km <= 0:
+        return jsonify({"error": "radius_km must be positive"}), 400
+    if page < 1 or not 1 <= per_page <= NEARBY_MAX_PER_PAGE:
+        return jsonify({"error": f"page must be >= 1 and per_page between 1 and {NEARBY_MAX_PER_PAGE}"}), 400
+
+    try:
+        matches = spot_index.search(
+            lat, lon, k=k, radius_km=radius_km,
+            experience=request.args.get("experience"), type=request.args.get("type"),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    start = (page - 1) * per_page
+    return jsonify({
+        "total": len(matches),
+        "page": page,
+        "per_page": per_page,
+        "spots": [dict(spot, distance_km=distance) for spot, distance in matches[start:start + per_page]],
+    })
+
+@bp.route("/geo-cache/stats", methods=["GET"])
+def geo_cache_stats():
+    return jsonify(geo_cache.stats())
+
+
+# Forecast steps bulk-inserted by the pipelines (see surfspots/forecast_db.py)
+FORECAST_WINDOW = timedelta(days=7)
+
+def _utc_arg(name, default):
+    value = request.args.get(name)
+    if not value:
+        return default
+    when = datetime.fromisoformat(value)
+    if when.tzinfo is not None:
+        when = when.astimezone(timezone.utc).replace(tzinfo=None)
+    return when
+
+def _iso_utc(naive):
+    return naive.replace(tzinfo=timezone.utc).isoformat()
+
+def _number(value):
+    return None if value is None or math.isnan(value) else value
+
+@bp.route("/surf-spots/<int:spot_id>/forecast", methods=["GET"])
+def get_spot_forecast(spot_id):
+    try:
+        start = _utc_arg("from", datetime.now(timezone.utc).replace(tzinfo=None, minute=0, second=0, microsecond=0))
+        end = _utc_arg("to", start + FORECAST_WINDOW)
+    except ValueError:
+        return jsonify({"error": "from and to must be ISO 8601"}), 400
+    if end <= start:
+        return jsonify({"error": "to must be after from"}), 400
+
+    # Latest cycle and the valid_time range are both served by
+    # ix_forecast_point_spot_cycle_valid: one index range scan
+    latest_cycle = (
+        db.session.query(db.func.max(ForecastPoint.cycle_time))
+        .filter(ForecastPoint.spot_id == spot_id)
+        .scalar_subquery()
+    )
+    points = (
+        ForecastPoint.query
+        .filter(
+            ForecastPoint.spot_id == spot_id,
+            ForecastPoint.cycle_time == latest_cycle,
+            ForecastPoint.valid_time >= start,
+            ForecastPoint.valid_time < end,
+        )
+        .order_by(ForecastPoint.valid_time)
+        .all()
+    )
+    if not points and db.session.get(SurfSpot, spot_id) is None:
+        return jsonify({"error": "Surf spot not found"}), 404
+
+    return jsonify({
+        "spot_id": spot_id,
+        "cycle_time": _iso_utc(points[0].cycle_time) if points else None,
+        "from": _iso_utc(start),
+        "to": _iso_utc(end),
+        "points": [
+            {
+                "time": _iso_utc(p.valid_time),
+                "surf_ft": _number(p.surf_ft),
+                "quality": p.quality,
+                "dir": _number(p.dir),
+                "tp": _number(p.tp),
+                "deep_hs": _number(p.deep_hs),
+            }
+            for p in points
+        ],
+    })
+
+# Materialized per-spot summary, rewritten by every forecast publish
+CONDITIONS_MAX_AGE = 60
+
+@bp.route("/surf-spots/conditions", methods=["GET"])
+def spot_conditions():
+    # One row per spot: no forecast rows are read or filtered here
+    rows = (
+        db.session.query(SpotConditions, SurfSpot)
+        .join(SurfSpot, SurfSpot.id == SpotConditions.spot_id)
+        .order_by(SurfSpot.name)
+        .all()
+    )
+    spots = [
+        {
+            "spot_id": spot.id,
+            "name": spot.name,
+            "latitude": spot.latitude,
+            "longitude": spot.longitude,
+            "run_id": c.run_id,
+            "now": {
+                "time": _iso_utc(c.now_time),
+                "surf_ft": c.now_surf_ft,
+                "quality": c.now_quality,
+                "dir": c.now_dir,
+                "tp": c.now_tp,
+            },
+            "next_peak": {
+                "time": _iso_utc(c.peak_time),
+                "surf_ft": c.peak_surf_ft,
+                "quality": c.peak_quality,
+                "tp": c.peak_tp,
+            } if c.peak_time else None,
+        }
+        for c, spot in rows
+    ]
+    response = make_response(jsonify({"spots": spots}))
+    # Content hash: identical across workers, changes with any publish
+    response.add_etag()
+    response.headers["Cache-Control"] = f"public, max-age={CONDITIONS_MAX_AGE}"
+    return response.make_conditional(request)
+
+# Forecast bundles written by the SWAN pipelines (see surfspots/forecast_bundle.py)
+def _forecast_spots():
+    base = current_app.config["FORECAST_DIR"]
+    spots = []
+    for name in sorted(os.listdir(base)):
+        try:
+            meta = read_meta(name, base)
+        except ValueError:
+            continue
+        if meta:
+            spots.append(meta)
+    return spots
+
+@bp.route("/forecasts", methods=["GET"])
+def list_forecasts():
+    # Small index so clients can check every spot's ETag in one request
+    spots = _forecast_spots()
+    response = make_response(jsonify({"forecasts": spots}))
+    # No ETag while nothing is published: "" would validate an empty list later
+    if spots:
+        response.set_etag("-".join(s["etag"] for s in spots))
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
+
+@bp.route("/forecasts/<spot>", methods=["GET"])
+def get_forecast_bundle(spot):
+    base = current_app.config["FORECAST_DIR"]
+    try:
+        meta = read_meta(spot, base)
+    except ValueError:
+        meta = None
+    if meta is None:
+        return jsonify({"error": f"No forecast published for {spot}"}), 404
+
+    # Unchanged forecast: answer from the metadata alone
+    if request.if_none_match.contains(meta["etag"]):
+        response = make_response("", 304)
+    else:
+        # Re-read together with the bytes so the ETag matches what is sent
+        meta, compressed = read_bundle(spot, base)
+        if meta is None:
+            return jsonify({"error": f"No forecast published for {spot}"}), 404
+        if request.accept_encodings["gzip"]:
+            response = make_response(compressed)
+            response.headers["Content-Encoding"] = "gzip"
+        else:
+            response = make_response(json.dumps({"spot": spot, "columns": decode_bundle(compressed)}))
+
+    response.set_etag(meta["etag"])
+    response.headers["Content-Type"] = "application/json"
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["Vary"] = "Accept-Encoding"
+    if meta.get("run_id"):
+        response.headers["X-Forecast-Run"] = meta["run_id"]
+    return response
+
+
+# Spot ranking published by the pipelines (see surfspots/spot_ranking.py)
+RANKING_LEVELS = ("beginner", "intermediate", "advanced")
+
+@bp.route("/rankings", methods=["GET"])
+def get_rankings():
+    level = request.args.get("level", "intermediate").lower()
+    if level not in RANKING_LEVELS:
+        return jsonify({"error": f"level must be one of {', '.join(RANKING_LEVELS)}"}), 400
+    try:
+        when = request.args.get("time")
+        when = datetime.fromisoformat(when) if when else datetime.now(timezone.utc)
+    except ValueError:
+        return jsonify({"error": "time must be ISO 8601"}), 400
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+
+    store = current_app.config["FORECAST_STORE"]
+    if not os.path.exists(store):
+        return jsonify({"error": "No ranking published"}), 404
+    conn = sqlite3.connect(f"file:{store}?mode=ro", uri=True)
+    try:
+        meta = conn.execute("SELECT version FROM ranking_meta WHERE id = 1").fetchone()
+        rows = conn.execute(
+            "SELECT valid_time, rank, spot, score, surf_ft, quality, tp FROM ranking "
+            "WHERE level = ? AND valid_time = ("
+            "  SELECT MIN(valid_time) FROM ranking WHERE level = ? AND valid_time >= ?"
+            ") ORDER BY rank",
+            (level, level, int(when.timestamp())),
+        ).fetchall()
+    except sqlite3.Error:
+        rows, meta = [], None
+    finally:
+        conn.close()
+    if not rows:
+        return jsonify({"error": "No ranking for that time"}), 404
+
+    valid_time = datetime.fromtimestamp(rows[0][0], timezone.utc)
+    response = make_response(jsonify({
+        "level": level,
+        "time": valid_time.isoformat(),
+        "spots": [
+            {"rank": r[1], "spot": r[2], "score": r[3], "surf_ft": r[4], "quality": r[5], "tp": r[6]}
+            for r in rows
+        ],
+    }))
+    # Same ranking run, level and time step -> same body
+    response.set_etag(f"{meta[0] if meta else ''}-{level}-{rows[0][0]}")
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
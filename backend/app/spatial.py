@@ -0,0 +1,305 @@
+import math
+import threading
+import time
+
+import numpy as np
+from sqlalchemy import event, select, text, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import db
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# SQLite R*Tree over surf_spot, kept in sync by triggers (migration c3d9a1e5f2b7)
+RTREE_TABLE = "surf_spot_rtree"
+RTREE_START_DEG = 0.25  # first search box half-width; grows 4x until k spots are certain
+
+# SurfSpot columns /surf-spots/nearby can filter on (case-insensitive match)
+FILTER_COLUMNS = ("experience", "type")
+# Skill levels accepted for experience, as the catalogue values they stand for
+EXPERIENCE_LEVELS = {"beginner": "all surfers", "experienced": "experienced surfers"}
+
+# How often a worker re-reads the shared catalogue version (seconds)
+CATALOGUE_CHECK_SECONDS = 5.0
+
+# Cap on the (locations x spots) dot-product block held at once by nearest_many
+CHUNK_CELLS = 2_000_000  # 16 MB of float64
+
+
+def to_unit(lat, lon):
+    """Latitude/longitude in degrees -> unit vectors on the sphere, shape (..., 3)."""
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    lon = np.radians(np.asarray(lon, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def chord_to_km(chord):
+    # Straight-line distance between unit vectors -> great-circle distance
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0, 1))
+
+
+def _partition(values):
+    """{lowercased value: row indices}, so a filter is a dict lookup, not a scan."""
+    groups = {}
+    for i, value in enumerate(values):
+        groups.setdefault((value or "").strip().lower(), []).append(i)
+    return {value: np.array(rows, dtype=np.intp) for value, rows in groups.items()}
+
+
+class SpotIndex:
+    """
+    In-memory index of surf spot coordinates as unit vectors.
+    Nearest spots are found with one matrix-vector product (largest dot
+    product == smallest great-circle distance), so a lookup never touches
+    the database. The index is rebuilt lazily after any SurfSpot change:
+    at once for writes made in this process, and within
+    CATALOGUE_CHECK_SECONDS for writes from other workers, which bump the
+    shared spot_catalogue_version row.
+    """
+
+    def __init__(self, check_seconds=CATALOGUE_CHECK_SECONDS):
+        self._lock = threading.Lock()
+        self._changes = 1  # bumped on every SurfSpot write in this process
+        self._built = 0  # value of _changes the current snapshot reflects
+        self._checked = 0.0  # monotonic time of the last catalogue version check
+        self.check_seconds = check_seconds
+        # (spots, xyz, partitions), swapped as one object so readers never mix builds
+        self._snapshot = ([], np.empty((0, 3)), {column: {} for column in FILTER_COLUMNS})
+        self.version = 0
+        self.catalogue_version = None  # shared version the snapshot was built from
+
+    def init_app(self, app):
+        from app.models import SurfSpot
+        for name in ("after_insert", "after_update", "after_delete"):
+            event.listen(SurfSpot, name, self._on_change)
+        self.check_seconds = app.config.get("SPOT_CATALOGUE_CHECK_SECONDS", self.check_seconds)
+
+        # The database backend needs a spatial index query for the dialect;
+        # anywhere else the in-memory index answers instead
+        if app.config.get("SPATIAL_BACKEND") == "database":
+            dialect = make_url(app.config["SQLALCHEMY_DATABASE_URI"]).get_backend_name()
+            if dialect in DB_NEAREST:
+                # With the database backend the index is only built if a route needs it
+                return
+            app.logger.warning("SPATIAL_BACKEND=database is not supported on %s; using the in-memory index", dialect)
+            app.config["SPATIAL_BACKEND"] = "memory"
+        # Build at startup; if the table is not there yet, the first request will
+        with app.app_context():
+            try:
+                self.rebuild()
+            except SQLAlchemyError:
+                pass
+
+    def _on_change(self, mapper, connection, target):
+        # Same transaction as the write, so other workers see both or neither
+        connection.execute(bump_catalogue_version())
+        self.invalidate()
+
+    def invalidate(self):
+        with self._lock:
+            self._changes += 1
+
+    def rebuild(self):
+        from app.models import SurfSpot
+        # A write landing during the query leaves the index stale for the next call
+        changes = self._changes
+        catalogue = read_catalogue_version()
+        rows = SurfSpot.query.all()
+        spots = [
+            {
+                "id": s.id,
+                "name": s.name,
+                "latitude": s.latitude,
+                "longitude": s.longitude,
+                "type": s.type,
+                "experience": s.experience,
+                "direction": s.direction,
+            }
+            for s in rows
+        ]
+        xyz = to_unit([s["latitude"] for s in spots], [s["longitude"] for s in spots]).reshape(-1, 3)
+        partitions = {column: _partition(s[column] for s in spots) for column in FILTER_COLUMNS}
+        with self._lock:
+            self._snapshot = (spots, xyz, partitions)
+            self._built = changes
+            self._checked = time.monotonic()
+            self.catalogue_version = catalogue
+            self.version += 1
+
+    def ensure(self):
+        if self._built != self._changes:
+            self.rebuild()
+        elif time.monotonic() - self._checked >= self.check_seconds:
+            # One primary-key read, at most every check_seconds per worker
+            self._checked = time.monotonic()
+            if read_catalogue_version() != self.catalogue_version:
+                self.rebuild()
+
+    @property
+    def spots(self):
+        self.ensure()
+        return self._snapshot[0]
+
+    def __len__(self):
+        return len(self.spots)
+
+    def nearest(self, lat, lon, k=1):
+        """[(spot dict, distance_km)] for the k closest spots, closest first."""
+        return self.search(lat, lon, k=k)
+
+    def filter_values(self, column):
+        """Sorted values `column` can be filtered on: the catalogue's own plus skill levels."""
+        self.ensure()
+        values = {value for value in self._snapshot[2][column] if value}
+        if column == "experience":
+            values.update(EXPERIENCE_LEVELS)
+        return sorted(values)
+
+    def search(self, lat, lon, k=None, radius_km=None, **filters):
+        """
+        [(spot dict, distance_km)] closest first: at most `k` spots, only
+        those within `radius_km`, and only rows whose FILTER_COLUMNS equal
+        the given values (e.g. type="reef-coral", experience="beginner").
+        None means no limit. Raises ValueError for a value no spot can have.
+        """
+        self.ensure()
+        spots, xyz, partitions = self._snapshot
+
+        rows = None
+        for column, value in filters.items():
+            if value is None:
+                continue
+            key = value.strip().lower()
+            if column == "experience":
+                key = EXPERIENCE_LEVELS.get(key, key)
+            match = partitions[column].get(key)
+            if match is None:
+                if key not in EXPERIENCE_LEVELS.values():
+                    raise ValueError(f"{column} must be one of: {', '.join(self.filter_values(column))}")
+                match = np.empty(0, dtype=np.intp)
+            rows = match if rows is None else np.intersect1d(rows, match, assume_unique=True)
+        if rows is None:
+            rows = slice(None)
+
+        # Rank on the dot product; distances only for the spots returned
+        q = to_unit(lat, lon)
+        ids = np.arange(len(spots))[rows]
+        dots = xyz[rows] @ q
+        if radius_km is not None:
+            inside = dots >= np.cos(min(radius_km / EARTH_RADIUS_KM, np.pi))
+            ids, dots = ids[inside], dots[inside]
+        if not len(ids):
+            return []
+        if k is not None and k < len(ids):
+            top = np.argpartition(-dots, k - 1)[:k] if k > 1 else np.array([np.argmax(dots)])
+            ids, dots = ids[top], dots[top]
+        ids = ids[np.argsort(-dots, kind="stable")]
+        dist = chord_to_km(np.linalg.norm(xyz[ids] - q, axis=1))
+        return [(spots[i], float(d)) for i, d in zip(ids, dist)]
+
+    def nearest_many(self, lats, lons, chunk_cells=CHUNK_CELLS):
+        """
+        Closest spot for each of many locations: (spots, indices, distances_km),
+        where indices[i] is the row in spots closest to (lats[i], lons[i]).
+        Computed as a locations x spots dot-product matrix, in row chunks
+        so memory stays bounded however many locations are sent.
+        """
+        self.ensure()
+        spots, xyz, _ = self._snapshot
+        q = to_unit(lats, lons).reshape(-1, 3)
+        idx = np.empty(len(q), dtype=np.intp)
+        if not spots:
+            return spots, idx[:0], np.empty(0)
+        step = max(1, chunk_cells // len(spots))
+        for start in range(0, len(q), step):
+            idx[start:start + step] = np.argmax(q[start:start + step] @ xyz.T, axis=1)
+        dist = chord_to_km(np.linalg.norm(xyz[idx] - q, axis=1))
+        return spots, idx, dist
+
+
+def bump_catalogue_version():
+    """UPDATE statement that marks the spot catalogue as changed for every worker."""
+    from app.models import SpotCatalogueVersion
+    table = SpotCatalogueVersion.__table__
+    return update(table).where(table.c.id == 1).values(version=table.c.version + 1)
+
+
+def read_catalogue_version():
+    from app.models import SpotCatalogueVersion
+    table = SpotCatalogueVersion.__table__
+    try:
+        return db.session.execute(select(table.c.version).where(table.c.id == 1)).scalar()
+    except SQLAlchemyError:
+        # Not migrated yet: local invalidation still works
+        db.session.rollback()
+        return None
+
+
+spot_index = SpotIndex()
+
+
+SPOT_COLUMNS = "s.id, s.name, s.latitude, s.longitude, s.type, s.experience, s.direction"
+
+
+def _with_distances(rows, lat, lon):
+    spots = [dict(row._mapping) for row in rows]
+    if not spots:
+        return []
+    xyz = to_unit([s["latitude"] for s in spots], [s["longitude"] for s in spots]).reshape(-1, 3)
+    dist = chord_to_km(np.linalg.norm(xyz - to_unit(lat, lon), axis=1))
+    return sorted(zip(spots, dist.tolist()), key=lambda pair: pair[1])
+
+
+def _nearest_postgres(lat, lon, k):
+    # <-> on the earthdistance cube is a KNN scan of ix_surf_spot_earth
+    rows = db.session.execute(
+        text(
+            f"SELECT {SPOT_COLUMNS} FROM surf_spot s "
+            "ORDER BY ll_to_earth(s.latitude, s.longitude) <-> ll_to_earth(:lat, :lon) LIMIT :k"
+        ),
+        {"lat": lat, "lon": lon, "k": k},
+    )
+    return _with_distances(rows, lat, lon)
+
+
+def _nearest_sqlite(lat, lon, k):
+    # R*Tree has no KNN: widen a bounding box until its inscribed circle holds k spots
+    half = RTREE_START_DEG
+    while True:
+        whole = half >= 180
+        dlon = 180.0
+        if abs(lat) + half < 90:
+            dlon = math.degrees(math.asin(min(1.0, math.sin(math.radians(half)) / math.cos(math.radians(lat)))))
+        if whole or lon - dlon < -180 or lon + dlon > 180:
+            lon_min, lon_max = -180.0, 180.0  # crosses the antimeridian: search every longitude
+        else:
+            lon_min, lon_max = lon - dlon, lon + dlon
+        rows = db.session.execute(
+            text(
+                f"SELECT {SPOT_COLUMNS} FROM surf_spot s JOIN {RTREE_TABLE} r ON r.id = s.id "
+                "WHERE r.max_lat >= :lat_min AND r.min_lat <= :lat_max "
+                "AND r.max_lon >= :lon_min AND r.min_lon <= :lon_max"
+            ),
+            {"lat_min": lat - half, "lat_max": lat + half, "lon_min": lon_min, "lon_max": lon_max},
+        )
+        found = _with_distances(rows, lat, lon)
+        # Anything within half degrees of arc is inside the box, so these k are final
+        if whole or (len(found) >= k and found[k - 1][1] <= half * KM_PER_DEGREE):
+            return found[:k]
+        half *= 4
+
+
+def nearest_in_db(lat, lon, k=1):
+    """
+    [(spot dict, distance_km)] for the k closest spots, found by the
+    database's spatial index so only those rows leave the database
+    (a dialect in DB_NEAREST).
+    """
+    return DB_NEAREST[db.engine.dialect.name](lat, lon, k)
+
+
+# Dialects with a spatial index query; SpotIndex.init_app falls back to memory for others
+DB_NEAREST = {"postgresql": _nearest_postgres, "sqlite": _nearest_sqlite}
@@ -1,42 +1,24 @@
 import streamlit as st
 import pandas as pd
-import json
 import plotly.express as px
-from datetime import datetime
 import os
+import sqlite3
 from dotenv import load_dotenv
 
+import forecast_data
+from forecast_data import SL_OFFSET, ForecastQuery, file_version, forecast_versions, sl_now
+from forecast_store import load_ranking, ranking_version
+from guide_context import build_session_table
+from guide_intents import answer_fast
+from guide_tools import ForecastTools
+from spot_ranking import LEVELS, rank_spots, ranking_key
+from spots import SPOTS
+from surf_guide import AnswerCache, GroqClient, stream_answer
+
 load_dotenv()
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 st.set_page_config(page_title="Ceylon Surfers AI", page_icon="🌊", layout="wide")
 
-SPOTS = {
-    "Arugam Bay": {
-        "path": "arugambay/arugambay_forecast.json",
-        "type": "Point Break",
-        "difficulty": "Intermediate to Expert",
-        "best_wind": "West / South-West"
-    },
-    "Ahangama": {
-        "path": "ahangama/ahangama_forecast.json",
-        "type": "Reef Break",
-        "difficulty": "Intermediate",
-        "best_wind": "North / North-East"
-    },
-    "Mirissa": {
-        "path": "mirissa/mirissa_forecast.json",
-        "type": "Point/Reef",
-        "difficulty": "All Levels",
-        "best_wind": "North"
-    },
-    "Hikkaduwa": {
-        "path": "hikkaduwa/hikkaduwa_forecast.json",
-        "type": "Reef Break",
-        "difficulty": "Advanced (Main Reef)",
-        "best_wind": "North-East"
-    }
-}
-
 with st.sidebar:
     st.title(" Ceylon Surfers")
     st.markdown("### Select Surf Spot")
@@ -63,21 +45,37 @@ with st.sidebar:
         """
     )
 
-@st.cache_data(ttl=3600) 
-def load_forecast(json_path):
-    # Handle relative paths safely
-    if not os.path.exists(json_path):
-        # Try to find it relative to current script if running from root
-        if os.path.exists(os.path.join("surfspots", json_path)):
-            json_path = os.path.join("surfspots", json_path)
-        else:
-            return None
-            
-    with open(json_path, 'r') as f:
-        data = json.load(f)
-    return pd.DataFrame(data)
+SPOT_FILES = {config["key"]: config["path"] for config in SPOTS.values()}
+
+# No TTL: the cache key is the run id / ETag / mtime of each spot, so a new
+# pipeline run shows up on the next rerun and unchanged data is never reparsed.
+@st.cache_data(max_entries=2, show_spinner=False)
+def load_forecasts(versions):
+    return ForecastQuery(forecast_data.load_all(SPOT_FILES))
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def load_guide_sessions(versions):
+    return build_session_table(forecasts)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def load_transects(json_path, mtime):
+    return forecast_data.load_transects(json_path)
+
+versions = forecast_versions(SPOT_FILES)
+forecasts = load_forecasts(versions)
 
-df = load_forecast(current_spot_config['path'])
+# One client and one answer cache per server process, shared by all sessions
+@st.cache_resource
+def get_guide_client(api_key):
+    return GroqClient(api_key)
+
+@st.cache_resource
+def get_answer_cache():
+    return AnswerCache()
+
+df = forecasts.spot(current_spot_config['key'])
+if df is not None:
+    df = df.reset_index()
 
 st.title(f"{selected_spot_name} 7-Day Forecast")
 
@@ -86,22 +84,8 @@ if df is None:
     st.info("Tip: Ensure you have run the pipeline for this specific spot folder.")
     st.stop()
 
-df['time'] = pd.to_datetime(df['time'], unit='ms')
-
-# FIX: Convert UTC to Sri Lanka Time (+5:30)
-df['time'] = df['time'] + pd.Timedelta(hours=5, minutes=30)
-
-# FIX: Patch initial zero direction artifact
-if len(df) > 1 and df.iloc[0]['dir'] == 0:
-    df.loc[0, 'dir'] = df.loc[1, 'dir']
-
-now = datetime.utcnow() + pd.Timedelta(hours=5, minutes=30)
-# Find row closest to "Now"
-current_row = df.iloc[0]
-for i, row in df.iterrows():
-    if row['time'] >= now:
-        current_row = row
-        break
+# Conditions right now, interpolated between the surrounding forecast steps
+current_row = forecasts.conditions(current_spot_config['key'], sl_now())
 
 col1, col2, col3, col4 = st.columns(4)
 with col1:
@@ -145,6 +129,74 @@ with col_data:
     display_df.columns = ['Time', 'Height (ft)', 'Rating', 'Dir']
     st.dataframe(display_df, hide_index=True, height=400)
 
+transects = load_transects(current_spot_config['transect'], file_version(current_spot_config['transect']))
+if transects:
+    st.divider()
+    st.subheader("Surf-Zone Profile")
+    st.caption("Wave height and breaking fraction from deep water to the beach.")
+
+    transect_name = list(transects.keys())[0]
+    if len(transects) > 1:
+        transect_name = st.selectbox("Transect", list(transects.keys()))
+    transect = transects[transect_name]
+
+    profile_times = pd.to_datetime(transect['times']) + SL_OFFSET
+    step = st.select_slider(
+        "Forecast Time",
+        options=list(range(len(profile_times))),
+        format_func=lambda i: profile_times[i].strftime('%a %d %H:%M'),
+    )
+
+    profile_df = pd.DataFrame({
+        "Distance (km)": transect['distance_km'],
+        "Hs (m)": transect['hs'][step],
+        "Breaking (Qb)": transect['qb'][step],
+        "Depth (m)": transect['depth'][step],
+    })
+    fig_profile = px.line(profile_df, x="Distance (km)", y=["Hs (m)", "Breaking (Qb)"], markers=True,
+                          hover_data=["Depth (m)"])
+    fig_profile.update_layout(height=350, legend_title_text="")
+    st.plotly_chart(fig_profile, use_container_width=True)
+
+
+st.divider()
+st.subheader("Where to Surf Now")
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def local_ranking(versions):
+    # Used until the pipelines have published a ranking for these runs
+    return rank_spots(forecasts.frame) if forecasts.frame is not None else None
+
+level = st.radio("Your level", LEVELS, horizontal=True, format_func=str.title)
+now_sl = sl_now()
+ranking = None
+try:
+    if ranking_version() == ranking_key(versions):
+        ranking = load_ranking(level, now_sl - SL_OFFSET)
+        if ranking is not None:
+            ranking['time'] = ranking['time'] + SL_OFFSET
+except sqlite3.Error:
+    pass
+if ranking is None:
+    ranked = local_ranking(versions)
+    if ranked is not None:
+        ranked = ranked[ranked['level'] == level]
+        upcoming = ranked[ranked['time'] >= now_sl]
+        step = upcoming['time'].min() if not upcoming.empty else ranked['time'].max()
+        ranking = ranked[ranked['time'] == step]
+
+if ranking is not None and not ranking.empty:
+    names = {config['key']: name for name, config in SPOTS.items()}
+    st.caption(f"Ranked for {ranking['time'].iloc[0]:%a %d %b %H:%M} (Sri Lanka time)")
+    rank_df = pd.DataFrame({
+        'Rank': ranking['rank'].values,
+        'Spot': [names.get(k, k) for k in ranking['spot']],
+        'Score': ranking['score'].values,
+        'Height (ft)': ranking['surf_ft'].round(1).values,
+        'Rating': ranking['quality'].values,
+        'Period (s)': ranking['tp'].round(1).values,
+    })
+    st.dataframe(rank_df, hide_index=True)
 
 st.divider()
 st.subheader(f" AI Guide: {selected_spot_name}")
@@ -165,47 +217,30 @@ if prompt := st.chat_input("Is it good for beginners tomorrow?"):
     with st.chat_message("assistant"):
         message_placeholder = st.empty()
         
-        if not GROQ_API_KEY:
+        now_sl = sl_now()
+        # The model looks up only the spots/days it needs, so the
+        # prompt stays the same size however many spots there are
+        toolbox = ForecastTools(forecasts, load_guide_sessions(versions), SPOTS, now_sl)
+        # Formulaic questions are answered straight from the data
+        response = answer_fast(prompt, toolbox, selected_spot_name)
+        
+        if response:
+            message_placeholder.markdown(response)
+        elif not GROQ_API_KEY:
             response = " AI is offline. Please set GROQ_API_KEY in .env file."
             message_placeholder.markdown(response)
         else:
             try:
-                from groq import Groq
-                client = Groq(api_key=GROQ_API_KEY)
-                
-                all_spots_info = []
-                now_sl = datetime.utcnow() + pd.Timedelta(hours=5, minutes=30)
-                
-                for s_name, s_config in SPOTS.items():
-                    try:
-                        s_df = load_forecast(s_config['path'])
-                        if s_df is not None:
-                            s_df['time'] = pd.to_datetime(s_df['time'], unit='ms') + pd.Timedelta(hours=5, minutes=30)
-                            # Get current condition
-                            future = s_df[s_df['time'] >= now_sl]
-                            if not future.empty:
-                                curr = future.iloc[0]
-                                all_spots_info.append(
-                                    f"- {s_name}: {curr['surf_ft']:.1f}ft ({curr['quality']}) | {s_config['difficulty']} | {s_config['type']}"
-                                )
-                    except Exception:
-                        continue
-                
-                global_context = "\n".join(all_spots_info)
-                context_df = df[['time', 'surf_ft', 'quality']].copy()
-                context_df['hour'] = context_df['time'].dt.hour
-                context_df['is_night'] = context_df['hour'].apply(lambda h: "YES" if (h >= 18 or h <= 5) else "NO")
-                context_df['time'] = context_df['time'].dt.strftime('%A %H:%M')
-                local_context_str = context_df.to_string(index=False)
+                client = get_guide_client(GROQ_API_KEY)
                 
                 system_prompt = f"""
                 You are an expert surf guide for Sri Lanka. You have real-time data for multiple spots.
                 
-                CURRENT CONDITIONS (ALL SPOTS):
-                {global_context}
+                NOW: {now_sl:%A %d %b %H:%M} (Sri Lanka time)
+                The user is looking at {selected_spot_name}.
                 
-                DETAILED FORECAST FOR SELECTED SPOT ({selected_spot_name}):
-                {local_context_str}
+                Use the forecast tools for every height, rating or time you mention; never guess.
+                Sessions are AM 07:00, MID 12:00 and PM 16:00; heights are face heights in ft.
                 
                 STRICT RULES:
                 1. **GLOBAL AWARENESS:** If the user asks "Where should I surf?", compare spots based on their skill level and current conditions.
@@ -218,17 +253,17 @@ if prompt := st.chat_input("Is it good for beginners tomorrow?"):
                 Answer concisely. If recommending other spots, mention why (e.g., "Mirissa is better for learning today").
                 """
                 
-                completion = client.chat.completions.create(
-                    model="llama-3.3-70b-versatile",
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.3, # Low temp for strict adherence to data
-                    max_tokens=250
-                )
+                messages = [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ]
+                # Same spot, same forecast runs, same hour, same question -> cached answer
+                cache_key = AnswerCache.key(current_spot_config['key'], versions, now_sl, prompt)
                 
-                response = completion.choices[0].message.content
+                response = ""
+                for text in stream_answer(client, get_answer_cache(), cache_key, messages, toolbox):
+                    response += text
+                    message_placeholder.markdown(response + "▌")
                 message_placeholder.markdown(response)
                 
             except Exception as e:
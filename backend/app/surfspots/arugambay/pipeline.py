@@ -2,7 +2,12 @@ import subprocess
 import sys
 import time
 import os
+
+# Shared SWAN tooling lives one level up in surfspots/
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from swan_helper import run_swan_in_wsl
+from swan_grid import convert_block
 
 def run_step(script):
     res = subprocess.run([sys.executable, script])
@@ -18,6 +23,7 @@ def main():
     run_step("03_boundary_conditions.py")
     run_step("04_configure_swan.py")
     run_swan_in_wsl()
+    convert_block()
     
     subprocess.run([sys.executable, "05_read_forecast.py"])
     
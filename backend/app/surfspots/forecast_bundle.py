@@ -0,0 +1,94 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+
+# Columnar, pre-compressed copy of each spot's forecast for the dashboard and
+# the HTTP API. Kept free of pandas/numpy so the Flask app can import it.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BUNDLE_COLUMNS = ["surf_ft", "quality", "dir", "tp", "deep_hs"]
+DECIMALS = 3
+
+RE_SPOT = re.compile(r"^[a-z0-9_-]+$")
+
+
+def bundle_paths(spot, base_dir=None):
+    """(<spot>/<spot>_forecast.json.gz, <spot>/<spot>_forecast.meta.json)"""
+    if not RE_SPOT.match(spot):
+        raise ValueError(f"Invalid spot name: {spot!r}")
+    folder = os.path.join(base_dir or BASE_DIR, spot)
+    return (
+        os.path.join(folder, f"{spot}_forecast.json.gz"),
+        os.path.join(folder, f"{spot}_forecast.meta.json"),
+    )
+
+
+def _atomic_write(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def encode_bundle(spot, df):
+    """Compact JSON {"spot", "columns": {name: [...]}} with times in epoch ms."""
+    times = df["time"].values.astype("datetime64[ms]").astype("int64").tolist()
+    columns = {"time": times}
+    for col in BUNDLE_COLUMNS:
+        values = df[col]
+        if values.dtype.kind == "f":
+            values = values.round(DECIMALS)
+        columns[col] = values.tolist()
+    return json.dumps({"spot": spot, "columns": columns}, separators=(",", ":")).encode()
+
+
+def write_bundle(spot, df, run_id=None, base_dir=None):
+    """
+    Write the gzip bundle and its metadata; returns the ETag.
+    The ETag hashes the forecast content only, so re-publishing an unchanged
+    forecast keeps the same tag and clients get a 304.
+    """
+    body = encode_bundle(spot, df)
+    etag = hashlib.sha256(body).hexdigest()[:20]
+    # mtime=0 keeps the compressed bytes identical for identical content
+    compressed = gzip.compress(body, compresslevel=9, mtime=0)
+
+    bundle_file, meta_file = bundle_paths(spot, base_dir)
+    meta = {
+        "spot": spot,
+        "etag": etag,
+        "run_id": run_id,
+        "rows": len(df),
+        "bytes": len(compressed),
+        "raw_bytes": len(body),
+    }
+    # Bundle first, then metadata: a reader never sees an ETag for bytes
+    # that are not on disk yet.
+    _atomic_write(bundle_file, compressed)
+    _atomic_write(meta_file, json.dumps(meta).encode())
+    return etag
+
+
+def read_meta(spot, base_dir=None):
+    """Bundle metadata (etag, run_id, sizes) or None if not published."""
+    _, meta_file = bundle_paths(spot, base_dir)
+    if not os.path.exists(meta_file):
+        return None
+    with open(meta_file) as f:
+        return json.load(f)
+
+
+def read_bundle(spot, base_dir=None):
+    """(meta, gzip bytes) as stored, or (None, None)."""
+    meta = read_meta(spot, base_dir)
+    if meta is None:
+        return None, None
+    bundle_file, _ = bundle_paths(spot, base_dir)
+    with open(bundle_file, "rb") as f:
+        return meta, f.read()
+
+
+def decode_bundle(compressed):
+    """gzip bytes -> {column: list}"""
+    return json.loads(gzip.decompress(compressed))["columns"]
@@ -0,0 +1,215 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from forecast_bundle import decode_bundle, read_bundle, read_meta
+from forecast_post import classify_quality
+from forecast_store import latest_run_id, load_latest
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Pipelines publish UTC; the dashboard and the chat work in Sri Lanka time
+SL_OFFSET = pd.Timedelta(hours=5, minutes=30)
+
+# Columns interpolated to a true "now"; everything else comes from a forecast step
+NUMERIC_COLUMNS = ["surf_ft", "tp", "deep_hs"]
+
+
+def _abs(path):
+    return path if os.path.isabs(path) else os.path.join(BASE_DIR, path)
+
+
+def file_version(path):
+    """mtime of a file (ns), or None if it does not exist."""
+    try:
+        return os.stat(_abs(path)).st_mtime_ns
+    except OSError:
+        return None
+
+
+def spot_version(key, json_path):
+    """
+    Cheap fingerprint of everything load_spot may read: latest run id in the
+    store, bundle ETag and JSON mtime. It changes exactly when a pipeline
+    publishes, so it can key a cache instead of a TTL.
+    """
+    try:
+        run_id = latest_run_id(key)
+    except sqlite3.Error:
+        run_id = None
+    try:
+        meta = read_meta(key)
+    except (OSError, ValueError):
+        meta = None
+    return run_id, meta["etag"] if meta else None, file_version(json_path)
+
+
+def forecast_versions(spots):
+    """spot_version for each {key: json_path}, as a hashable tuple."""
+    return tuple((key, spot_version(key, path)) for key, path in spots.items())
+
+
+def _read_raw(key, json_path):
+    # Latest published run from the forecast store (one indexed query)
+    try:
+        _, df = load_latest(key)
+        if df is not None:
+            return df
+    except sqlite3.Error:
+        pass
+
+    # Fallback 1: the compressed columnar bundle
+    try:
+        _, compressed = read_bundle(key)
+    except (OSError, ValueError):
+        compressed = None
+    if compressed:
+        df = pd.DataFrame(decode_bundle(compressed))
+        df['time'] = pd.to_datetime(df['time'], unit='ms')
+        return df
+
+    # Fallback 2: the JSON written next to the pipeline scripts
+    json_path = _abs(json_path)
+    if not os.path.exists(json_path):
+        return None
+    with open(json_path, 'r') as f:
+        df = pd.DataFrame(json.load(f))
+    df['time'] = pd.to_datetime(df['time'], unit='ms')
+    return df
+
+
+def load_spot(key, json_path):
+    """One spot's forecast in Sri Lanka time, display fixes applied, or None."""
+    df = _read_raw(key, json_path)
+    if df is None or df.empty:
+        return None
+
+    df = df.sort_values('time').reset_index(drop=True)
+    df['time'] = df['time'] + SL_OFFSET
+
+    # Patch initial zero direction artifact (SWAN's first output step)
+    if len(df) > 1 and df.loc[0, 'dir'] == 0:
+        df.loc[0, 'dir'] = df.loc[1, 'dir']
+    return df
+
+
+def load_all(spots):
+    """
+    Every spot's forecast in one frame indexed by (spot, time).
+    `frame.loc[key]` gives a time-indexed frame for a single spot.
+    """
+    frames = []
+    for key, json_path in spots.items():
+        df = load_spot(key, json_path)
+        if df is not None:
+            frames.append(df.assign(spot=key))
+    if not frames:
+        return None
+    return pd.concat(frames, ignore_index=True).set_index(['spot', 'time']).sort_index()
+
+
+def sl_now():
+    return pd.Timestamp(datetime.utcnow()) + SL_OFFSET
+
+
+class ForecastQuery:
+    """
+    Time lookups on the load_all frame, shared by the dashboard and the chat.
+    Each spot's times are kept as a sorted int64 array, so finding "now" is a
+    binary search instead of a scan.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+        self._spots = {}
+        if frame is not None:
+            for key in frame.index.unique('spot'):
+                df = frame.loc[key]
+                self._spots[key] = (df, df.index.values.astype('datetime64[ns]').astype(np.int64))
+
+    @property
+    def spots(self):
+        return list(self._spots)
+
+    def spot(self, key):
+        """Time-indexed forecast for one spot, or None."""
+        entry = self._spots.get(key)
+        return entry[0] if entry else None
+
+    def _locate(self, key, when):
+        df, times = self._spots[key]
+        t = pd.Timestamp(sl_now() if when is None else when).value
+        return df, times, t, int(np.searchsorted(times, t, side='left'))
+
+    def current(self, key, when=None):
+        """First forecast step at or after `when` (default: now), or None past the end."""
+        if key not in self._spots:
+            return None
+        df, _, _, i = self._locate(key, when)
+        if i == len(df):
+            return None
+        return df.iloc[i].rename(df.index[i])
+
+    def conditions(self, key, when=None, clamp=True):
+        """
+        Conditions at `when` interpolated between the two surrounding steps,
+        with the rating recomputed from the interpolated face height.
+        Before the forecast the first step is used; past its end the last
+        step, or None if not `clamp`.
+        """
+        if key not in self._spots:
+            return None
+        df, times, t, i = self._locate(key, when)
+        if i == 0:
+            return df.iloc[0].rename(df.index[0])
+        if i == len(df):
+            return df.iloc[-1].rename(df.index[-1]) if clamp else None
+        return self.sample(key, [t]).iloc[0]
+
+    def sample(self, key, times):
+        """
+        Conditions at many times at once, interpolated between forecast steps
+        (clamped to the first/last step outside the forecast).
+        """
+        df, steps = self._spots[key]
+        index = pd.DatetimeIndex(times, name='time')
+        x = index.values.astype('datetime64[ns]').astype(np.int64)
+        out = pd.DataFrame(index=index)
+        for col in NUMERIC_COLUMNS:
+            out[col] = np.interp(x, steps, df[col].values.astype(np.float64))
+        # Directions on the unit circle so 350° -> 10° passes through 0°
+        rad = np.radians(df['dir'].values.astype(np.float64))
+        s = np.interp(x, steps, np.sin(rad))
+        c = np.interp(x, steps, np.cos(rad))
+        out['dir'] = np.degrees(np.arctan2(s, c)) % 360
+        out['quality'] = classify_quality(out['surf_ft'].values)
+        return out[df.columns]
+
+    def next_hours(self, key, hours, when=None):
+        """Forecast steps in [when, when + hours)."""
+        if key not in self._spots:
+            return None
+        df, times, t, i = self._locate(key, when)
+        end = t + pd.Timedelta(hours=hours).value
+        j = int(np.searchsorted(times, end, side='left'))
+        return df.iloc[i:j]
+
+    def conditions_all(self, when=None):
+        """Interpolated conditions for every spot that still has forecast data."""
+        rows = {key: self.conditions(key, when, clamp=False) for key in self._spots}
+        rows = {key: row for key, row in rows.items() if row is not None}
+        if not rows:
+            return pd.DataFrame(columns=list(self.frame.columns) if self.frame is not None else [])
+        return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def load_transects(json_path):
+    json_path = _abs(json_path)
+    if not os.path.exists(json_path):
+        return None
+    with open(json_path, 'r') as f:
+        return json.load(f)
@@ -0,0 +1,127 @@
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from forecast_data import SL_OFFSET
+from forecast_store import FORECAST_COLUMNS, RETENTION_DAYS
+from spot_ranking import DAYLIGHT
+from spots import SPOTS
+
+# The Flask API's database; forecast points are only written when it is set
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+NEXT_PEAK_HOURS = 48
+
+
+def _points(spot_id, df, run_id, cycle_time):
+    times = [t.to_pydatetime() for t in pd.to_datetime(df["time"])]
+    columns = {c: df[c].tolist() for c in FORECAST_COLUMNS}
+    return [
+        {
+            "spot_id": spot_id, "cycle_time": cycle_time, "valid_time": t, "run_id": run_id,
+            **{c: columns[c][i] for c in FORECAST_COLUMNS},
+        }
+        for i, t in enumerate(times)
+    ]
+
+
+def _num(value):
+    return None if pd.isna(value) else float(value)
+
+
+def summarize(spot_id, df, run_id, cycle_time, now=None):
+    """
+    spot_conditions row for a run: the step in force at `now` (UTC, default
+    the current time; the first step if the run starts later) and the
+    biggest daylight step in the NEXT_PEAK_HOURS after it.
+    """
+    now = pd.Timestamp(now or datetime.utcnow())
+    times = pd.to_datetime(df["time"]).reset_index(drop=True)
+    df = df.reset_index(drop=True)
+    past = (times <= now).to_numpy()
+    i = int(past.nonzero()[0][-1]) if past.any() else 0
+    current = df.iloc[i]
+
+    hours = (times + SL_OFFSET).dt.hour
+    ahead = (
+        (times > times[i]) & (times <= times[i] + pd.Timedelta(hours=NEXT_PEAK_HOURS))
+        & (hours >= DAYLIGHT[0]) & (hours < DAYLIGHT[1])
+    )
+    surf = df["surf_ft"].where(ahead)
+    peak = surf.idxmax() if surf.notna().any() else None
+    return {
+        "spot_id": spot_id,
+        "run_id": run_id,
+        "cycle_time": cycle_time,
+        "refreshed_at": datetime.utcnow().replace(microsecond=0),
+        "now_time": times[i].to_pydatetime(),
+        "now_surf_ft": _num(current["surf_ft"]),
+        "now_quality": current["quality"],
+        "now_dir": _num(current["dir"]),
+        "now_tp": _num(current["tp"]),
+        "peak_time": times[peak].to_pydatetime() if peak is not None else None,
+        "peak_surf_ft": _num(df.at[peak, "surf_ft"]) if peak is not None else None,
+        "peak_quality": df.at[peak, "quality"] if peak is not None else None,
+        "peak_tp": _num(df.at[peak, "tp"]) if peak is not None else None,
+    }
+
+
+def publish_points(spot, df, run_id, cycle_time=None, database_url=None, retention_days=RETENTION_DAYS):
+    """
+    Bulk-insert a run into the API's forecast_point table (times in UTC),
+    replacing any earlier copy of the same cycle and dropping cycles older
+    than the retention window, and rewrite the spot's spot_conditions
+    summary from it, in one transaction. `spot` is the pipeline
+    key; the row is linked to the surf_spot with its SPOTS display name.
+    Returns the number of points written (0 without a database or without
+    a surf_spot row for the spot).
+    """
+    database_url = database_url or DATABASE_URL
+    if not database_url:
+        return 0
+    import sqlalchemy as sa
+
+    # Typed columns so DateTime values are stored exactly as the API's model stores them
+    spots = sa.table("surf_spot", sa.column("id", sa.Integer), sa.column("name", sa.String))
+    points_table = sa.table(
+        "forecast_point",
+        sa.column("spot_id", sa.Integer), sa.column("cycle_time", sa.DateTime),
+        sa.column("valid_time", sa.DateTime), sa.column("run_id", sa.String),
+        *(sa.column(c, sa.String if c == "quality" else sa.Float) for c in FORECAST_COLUMNS),
+    )
+    conditions = sa.table(
+        "spot_conditions",
+        sa.column("spot_id", sa.Integer), sa.column("run_id", sa.String),
+        *(sa.column(c, sa.DateTime) for c in ("cycle_time", "refreshed_at", "now_time", "peak_time")),
+        *(sa.column(c, sa.Float) for c in ("now_surf_ft", "now_dir", "now_tp", "peak_surf_ft", "peak_tp")),
+        *(sa.column(c, sa.String) for c in ("now_quality", "peak_quality")),
+    )
+
+    name = next((n for n, config in SPOTS.items() if config["key"] == spot), spot)
+    cycle = pd.Timestamp(df["time"].iloc[0] if cycle_time is None else cycle_time).to_pydatetime()
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+
+    engine = sa.create_engine(database_url)
+    try:
+        with engine.begin() as conn:
+            spot_id = conn.execute(sa.select(spots.c.id).where(spots.c.name == name)).scalar()
+            if spot_id is None:
+                # The catalogue is not imported yet; the rest of the run still publishes
+                print(f"Warning: no surf_spot named {name!r}, forecast points not saved (run `flask import-spots`)")
+                return 0
+            conn.execute(
+                points_table.delete().where(
+                    (points_table.c.spot_id == spot_id)
+                    & ((points_table.c.cycle_time == cycle) | (points_table.c.cycle_time < cutoff))
+                )
+            )
+            points = _points(spot_id, df, run_id, cycle)
+            # executemany: batched into multi-row INSERTs by the dialect
+            conn.execute(points_table.insert(), points)
+
+            conn.execute(conditions.delete().where(conditions.c.spot_id == spot_id))
+            conn.execute(conditions.insert(), [summarize(spot_id, df, run_id, cycle)])
+    finally:
+        engine.dispose()
+    return len(points)
@@ -0,0 +1,117 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+M_TO_FT = 3.28084
+
+# Face height (ft) upper bounds for each rating, used with np.digitize
+QUALITY_THRESHOLDS = [1.0, 2.5, 4.0, 7.5, 12.0]
+QUALITY_LABELS = np.array(["FLAT", "POOR", "FAIR", "GOOD", "EPIC", "XL / DANGEROUS"])
+# Rating order, worst to best; XL / DANGEROUS is ranked below EPIC for surfing
+QUALITY_RANK = {"FLAT": 0, "POOR": 1, "FAIR": 2, "XL / DANGEROUS": 2, "GOOD": 3, "EPIC": 4}
+
+
+def classify_quality(face_height_ft):
+    """Vectorised rating for an array of face heights (ft)."""
+    return QUALITY_LABELS[np.digitize(face_height_ft, QUALITY_THRESHOLDS)]
+
+
+def get_surf_quality(face_height_ft):
+    return str(classify_quality([face_height_ft])[0])
+
+
+def align_boundary(df_bnd, times, columns=("Deep_Hs", "Deep_Tp", "Deep_Dir")):
+    """
+    Boundary values at the SWAN output times.
+    TPAR records are 6-hourly while SWAN writes every 3 hours; SWAN itself
+    interpolates the boundary linearly in time, so the same is done here
+    instead of pairing rows by position. Times outside the boundary
+    record are dropped rather than extrapolated.
+    """
+    bnd = df_bnd.sort_values("time")
+    bnd_t = bnd["time"].values.astype("datetime64[s]").astype(np.int64)
+    out_t = np.asarray(times, dtype="datetime64[s]").astype(np.int64)
+    inside = (out_t >= bnd_t[0]) & (out_t <= bnd_t[-1])
+
+    # ns like every other pandas time column: to_json writes it as epoch ms,
+    # which the dashboard reads back with unit='ms'
+    aligned = pd.DataFrame({"time": pd.to_datetime(np.asarray(times)[inside]).astype("datetime64[ns]")})
+    for col in columns:
+        values = bnd[col].values.astype(np.float64)
+        if col.endswith("Dir"):
+            # Interpolate directions on the unit circle
+            rad = np.radians(values)
+            s = np.interp(out_t[inside], bnd_t, np.sin(rad))
+            c = np.interp(out_t[inside], bnd_t, np.cos(rad))
+            aligned[col] = np.degrees(np.arctan2(s, c)) % 360
+        else:
+            aligned[col] = np.interp(out_t[inside], bnd_t, values)
+    return aligned, inside
+
+
+def build_forecast(df_bnd, tables, point="SURF", surf_factor=1.0):
+    """
+    One row per SWAN output time with boundary and local values joined on
+    the real timestamps, face height and rating computed for all rows at once.
+    """
+    aligned, inside = align_boundary(df_bnd, tables.times)
+
+    deep_hs = aligned["Deep_Hs"].values
+    surf_ft = deep_hs * surf_factor * M_TO_FT
+
+    return pd.DataFrame({
+        "time": aligned["time"],
+        "deep_hs": deep_hs,
+        "swan_hs": tables.get(point, "Hs")[inside].astype(np.float64),
+        "surf_ft": surf_ft,
+        "tp": tables.get(point, "Tp")[inside].astype(np.float64),
+        "dir": tables.get(point, "Dir")[inside].astype(np.float64),
+        "quality": classify_quality(surf_ft),
+    })
+
+
+def print_report(df_res, surf_factor=1.0):
+    """Console summary and timeline rendered straight from the forecast frame."""
+    peak = df_res.loc[df_res['surf_ft'].idxmax()]
+
+    print(f"{'METRIC':<25} {'VALUE':<25}")
+    print("-" * 60)
+    print(f"{'Best Time':<25} {peak['time'].strftime('%d-%b %I:%M %p')}")
+    print(f"{'Offshore Swell':<25} {peak['deep_hs']:.2f} m @ {peak['tp']:.1f} s")
+    print(f"{'Swell Direction':<25} {peak['dir']:.0f}° (Local Wrap)")
+    print("-" * 60)
+    print(f"{'PREDICTED FACE':<25} {peak['surf_ft']:.1f} - {peak['surf_ft']+1.5:.1f} ft")
+    print(f"{'CONDITION':<25} {peak['quality']}")
+    print("=" * 80)
+
+    print("\nENGINEERING CALIBRATION:")
+    print(f"   Model Raw Output (Grid): {peak['swan_hs']:.2f}m")
+    print(f"   Boundary Input (Deep):   {peak['deep_hs']:.2f}m")
+    print(f"   Applied MOS Factor:      {surf_factor:.3f}x (Shoaling + Refraction)")
+    print(f"   Calibrated Height:       {peak['surf_ft']/M_TO_FT:.2f}m ({peak['surf_ft']:.1f}ft)\n")
+
+    print("24-HOUR TIMELINE")
+    print("-" * 100)
+    print(f"{'TIME':<15} {'DEEP Hs':<10} {'SWAN Hs':<10} {'SURF FACE (Calibrated)':<25} {'DIR':<5} {'PER':<5} {'RATING'}")
+    print("-" * 100)
+
+    markers = np.where(df_res['surf_ft'].values == peak['surf_ft'], "★", " ")
+    lines = [
+        f"{t:<15} {d:<6.2f}m    {s:<6.2f}m    {m} {f:<4.1f} ft ({f/3.28:.1f}m)        {di:<5.0f} {tp:<5.1f} {q}"
+        for t, d, s, m, f, di, tp, q in zip(
+            df_res['time'].dt.strftime("%d-%b %H:%M"), df_res['deep_hs'], df_res['swan_hs'], markers,
+            df_res['surf_ft'], df_res['dir'], df_res['tp'], df_res['quality'],
+        )
+    ]
+    print("\n".join(lines))
+
+    print("-" * 100)
+    print("Forecast generation complete.")
+
+
+def save_json(json_df, filename):
+    """Write the frontend JSON via a temp file so readers never see half a file."""
+    tmp = f"{filename}.tmp"
+    json_df.to_json(tmp, orient='records', indent=4)
+    os.replace(tmp, filename)
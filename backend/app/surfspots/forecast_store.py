@@ -0,0 +1,255 @@
+import json
+import os
+import sqlite3
+import time
+import uuid
+from datetime import datetime
+from urllib.parse import quote
+
+import pandas as pd
+
+# One SQLite file shared by every spot pipeline and the dashboard
+STORE_PATH = os.getenv(
+    "FORECAST_STORE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "forecast_runs.db"),
+)
+RETENTION_DAYS = int(os.getenv("FORECAST_RETENTION_DAYS", 30))
+
+FORECAST_COLUMNS = ["surf_ft", "quality", "dir", "tp", "deep_hs"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    spot        TEXT NOT NULL,
+    cycle_time  INTEGER NOT NULL,
+    created_at  INTEGER NOT NULL,
+    n_rows      INTEGER NOT NULL,
+    meta        TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_runs_spot_cycle ON runs (spot, cycle_time);
+
+CREATE TABLE IF NOT EXISTS forecast (
+    run_id      TEXT NOT NULL,
+    valid_time  INTEGER NOT NULL,
+    surf_ft     REAL,
+    quality     TEXT,
+    dir         REAL,
+    tp          REAL,
+    deep_hs     REAL,
+    PRIMARY KEY (run_id, valid_time)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS latest (
+    spot        TEXT PRIMARY KEY,
+    run_id      TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS ranking (
+    level       TEXT NOT NULL,
+    valid_time  INTEGER NOT NULL,
+    rank        INTEGER NOT NULL,
+    spot        TEXT NOT NULL,
+    score       REAL,
+    surf_ft     REAL,
+    quality     TEXT,
+    tp          REAL,
+    PRIMARY KEY (level, valid_time, rank)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS ranking_meta (
+    id          INTEGER PRIMARY KEY CHECK (id = 1),
+    version     TEXT NOT NULL,
+    created_at  INTEGER NOT NULL
+);
+"""
+
+RANKING_COLUMNS = ["level", "valid_time", "rank", "spot", "score", "surf_ft", "quality", "tp"]
+
+
+def connect(path=None):
+    """Writer connection: creates the store and its schema if needed."""
+    conn = sqlite3.connect(path or STORE_PATH, timeout=30)
+    # WAL lets the dashboard read while a pipeline is publishing
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def connect_readonly(path=None):
+    """Reader connection (no DDL, never creates the file), or None if nothing was published yet."""
+    path = os.path.abspath(path or STORE_PATH)
+    if not os.path.exists(path):
+        return None
+    return sqlite3.connect(f"file:{quote(path)}?mode=ro", uri=True, timeout=30)
+
+
+def _read(query, params=(), path=None):
+    """Rows of a read-only query; [] while the store or the table does not exist."""
+    conn = connect_readonly(path)
+    if conn is None:
+        return []
+    try:
+        return conn.execute(query, params).fetchall()
+    except sqlite3.OperationalError as e:
+        # A store written before e.g. the first ranking publish
+        if "no such table" in str(e):
+            return []
+        raise
+    finally:
+        conn.close()
+
+
+def _epoch(values):
+    return pd.to_datetime(values).astype("datetime64[s]").astype("int64")
+
+
+def publish_run(spot, df, cycle_time=None, meta=None, path=None, retention_days=RETENTION_DAYS):
+    """
+    Store a forecast run and make it the latest for `spot` in one transaction,
+    so readers see either the previous run or the complete new one.
+    Returns the new run id.
+    """
+    times = _epoch(df["time"])
+    cycle = int(times.iloc[0]) if cycle_time is None else int(pd.Timestamp(cycle_time).timestamp())
+    run_id = f"{spot}-{datetime.utcfromtimestamp(cycle):%Y%m%d%H}-{uuid.uuid4().hex[:8]}"
+
+    rows = list(zip(
+        [run_id] * len(df), times.tolist(),
+        *(df[c].tolist() for c in FORECAST_COLUMNS),
+    ))
+
+    conn = connect(path)
+    try:
+        with conn:
+            conn.execute(
+                "INSERT INTO runs (run_id, spot, cycle_time, created_at, n_rows, meta) VALUES (?, ?, ?, ?, ?, ?)",
+                (run_id, spot, cycle, int(time.time()), len(rows), json.dumps(meta or {})),
+            )
+            conn.executemany(
+                "INSERT INTO forecast (run_id, valid_time, surf_ft, quality, dir, tp, deep_hs) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                "INSERT INTO latest (spot, run_id) VALUES (?, ?) "
+                "ON CONFLICT(spot) DO UPDATE SET run_id = excluded.run_id",
+                (spot, run_id),
+            )
+        prune_runs(conn, retention_days)
+    finally:
+        conn.close()
+    return run_id
+
+
+def prune_runs(conn, retention_days=RETENTION_DAYS):
+    """Delete runs older than the retention window, never a spot's latest run."""
+    cutoff = int(time.time() - retention_days * 86400)
+    with conn:
+        old = [r[0] for r in conn.execute(
+            "SELECT run_id FROM runs WHERE created_at < ? AND run_id NOT IN (SELECT run_id FROM latest)",
+            (cutoff,),
+        )]
+        conn.executemany("DELETE FROM forecast WHERE run_id = ?", [(r,) for r in old])
+        conn.executemany("DELETE FROM runs WHERE run_id = ?", [(r,) for r in old])
+    return len(old)
+
+
+def _to_frame(rows):
+    df = pd.DataFrame(rows, columns=["time"] + FORECAST_COLUMNS)
+    df["time"] = pd.to_datetime(df["time"], unit="s")
+    return df
+
+
+def latest_run_id(spot, path=None):
+    rows = _read("SELECT run_id FROM latest WHERE spot = ?", (spot,), path)
+    return rows[0][0] if rows else None
+
+
+def load_latest(spot, path=None):
+    """(run_id, DataFrame) of the latest published run, or (None, None)."""
+    rows = _read(
+        "SELECT l.run_id, f.valid_time, f.surf_ft, f.quality, f.dir, f.tp, f.deep_hs "
+        "FROM latest l JOIN forecast f ON f.run_id = l.run_id "
+        "WHERE l.spot = ? ORDER BY f.valid_time",
+        (spot,), path,
+    )
+    if not rows:
+        return None, None
+    return rows[0][0], _to_frame([r[1:] for r in rows])
+
+
+def load_run(run_id, path=None):
+    rows = _read(
+        "SELECT valid_time, surf_ft, quality, dir, tp, deep_hs FROM forecast "
+        "WHERE run_id = ? ORDER BY valid_time",
+        (run_id,), path,
+    )
+    return _to_frame(rows) if rows else None
+
+
+def list_runs(spot, since=None, path=None):
+    """Past runs for a spot (newest first), e.g. for forecast verification."""
+    query = "SELECT run_id, cycle_time, created_at, n_rows, meta FROM runs WHERE spot = ?"
+    params = [spot]
+    if since is not None:
+        query += " AND cycle_time >= ?"
+        params.append(int(pd.Timestamp(since).timestamp()))
+    query += " ORDER BY cycle_time DESC, created_at DESC"
+
+    rows = _read(query, params, path)
+    runs = pd.DataFrame(rows, columns=["run_id", "cycle_time", "created_at", "n_rows", "meta"])
+    runs["cycle_time"] = pd.to_datetime(runs["cycle_time"], unit="s")
+    runs["created_at"] = pd.to_datetime(runs["created_at"], unit="s")
+    return runs
+
+
+def publish_ranking(ranked, version, path=None):
+    """
+    Replace the published ranking with `ranked` (columns level, time, rank,
+    spot, score, surf_ft, quality, tp; time in UTC) in one transaction.
+    `version` identifies the set of runs it was computed from.
+    """
+    df = ranked.assign(valid_time=_epoch(ranked["time"]))
+    rows = list(zip(*(df[c].tolist() for c in RANKING_COLUMNS)))
+
+    conn = connect(path)
+    try:
+        with conn:
+            conn.execute("DELETE FROM ranking")
+            conn.executemany(
+                f"INSERT INTO ranking ({', '.join(RANKING_COLUMNS)}) VALUES ({', '.join('?' * len(RANKING_COLUMNS))})",
+                rows,
+            )
+            conn.execute(
+                "INSERT INTO ranking_meta (id, version, created_at) VALUES (1, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET version = excluded.version, created_at = excluded.created_at",
+                (version, int(time.time())),
+            )
+    finally:
+        conn.close()
+    return len(rows)
+
+
+def ranking_version(path=None):
+    rows = _read("SELECT version FROM ranking_meta WHERE id = 1", path=path)
+    return rows[0][0] if rows else None
+
+
+def load_ranking(level, when=None, path=None):
+    """
+    Ranked spots for `level` at the first step at or after `when` (UTC,
+    default now), best first; None if nothing is published for that time.
+    """
+    t = int(time.time()) if when is None else int(pd.Timestamp(when).timestamp())
+    rows = _read(
+        "SELECT valid_time, rank, spot, score, surf_ft, quality, tp FROM ranking "
+        "WHERE level = ? AND valid_time = ("
+        "  SELECT MIN(valid_time) FROM ranking WHERE level = ? AND valid_time >= ?"
+        ") ORDER BY rank",
+        (level, level, t), path,
+    )
+    if not rows:
+        return None
+    df = pd.DataFrame(rows, columns=["time", "rank", "spot", "score", "surf_ft", "quality", "tp"])
+    df["time"] = pd.to_datetime(df["time"], unit="s")
+    return df
@@ -0,0 +1,53 @@
+import pandas as pd
+
+# Daylight sessions sampled per day (Sri Lanka hour). Night (6PM-6AM) is
+# left out entirely, which the guide's NIGHT TIME rule forbids anyway.
+SESSIONS = [("AM", 7), ("MID", 12), ("PM", 16)]
+
+
+def build_session_table(query):
+    """
+    Conditions at every daylight session of every spot, indexed by
+    (date, spot, time) so one day across all spots is a single .loc lookup.
+    Each spot's sessions are interpolated from its forecast in one call.
+    """
+    labels = {h: label for label, h in SESSIONS}
+    frames = []
+    for key in query.spots:
+        df = query.spot(key)
+        first, last = df.index[0], df.index[-1]
+        days = pd.date_range(first.normalize(), last.normalize(), freq="D")
+        times = [day + pd.Timedelta(hours=h) for day in days for _, h in SESSIONS]
+        times = [t for t in times if first <= t <= last]
+        if not times:
+            continue
+        samples = query.sample(key, times).reset_index()
+        samples['spot'] = key
+        samples['date'] = samples['time'].dt.date
+        samples['session'] = samples['time'].dt.hour.map(labels)
+        frames.append(samples)
+    if not frames:
+        return None
+    return pd.concat(frames, ignore_index=True).set_index(['date', 'spot', 'time']).sort_index()
+
+
+def spot_summary(table, key):
+    """
+    [(date, line)] with one compact line per forecast day, e.g.
+    "Tue 25: AM 3.1 FAIR, MID 3.4 FAIR, PM 2.8 POOR (12s)"
+    (face height in ft per session, mean period).
+    """
+    if table is None or key not in table.index.unique('spot'):
+        return []
+    rows = table.xs(key, level='spot')
+    lines = []
+    for day, day_rows in rows.groupby(level='date'):
+        sessions = ", ".join(
+            f"{session} {ft:.1f} {quality}"
+            for session, ft, quality in zip(day_rows['session'], day_rows['surf_ft'], day_rows['quality'])
+        )
+        # SWAN exception values (negative periods) are left out
+        periods = day_rows['tp'][day_rows['tp'] > 0]
+        period = f" ({periods.mean():.0f}s)" if not periods.empty else ""
+        lines.append((day, f"{day:%a %d}: {sessions}{period}"))
+    return lines
@@ -0,0 +1,160 @@
+import re
+
+# Formulaic questions answered straight from the forecast tools, without an
+# LLM round-trip. Anything that does not match (or is long) returns None
+# and goes to the model.
+MAX_WORDS = 12
+
+RE_TOMORROW = re.compile(r"\btomorrow\b")
+SESSION_PATTERNS = [
+    ("AM", re.compile(r"\b(morning|sunrise|early)\b")),
+    ("MID", re.compile(r"\b(midday|noon|lunch)\b")),
+    ("PM", re.compile(r"\b(afternoon|evening|sunset)\b")),
+]
+SESSION_NAMES = {"AM": "morning", "MID": "midday", "PM": "afternoon"}
+
+RE_NIGHT = re.compile(r"\b(tonight|night|midnight|dark)\b")
+RE_BEGINNER = re.compile(r"\b(beginners?|learn(ing|er|ers)?|first[- ]timers?|newbies?|novices?)\b")
+RE_BIGGEST = re.compile(r"\b(biggest|largest|most swell)\b")
+RE_BEST_TIME = re.compile(r"\b(best|good|ideal) time\b|\bwhen should\b|\bwhen is it best\b")
+RE_SIZE = re.compile(r"\b(how big|how are the waves|wave height|surf height|how is it|how's it|conditions)\b")
+
+# Rule 2 of the guide prompt: beginners want 2-4ft
+BEGINNER_FT = (2.0, 4.0)
+
+
+def _when(question):
+    """(date word, session or None); "today" without a session means right now."""
+    day = "tomorrow" if RE_TOMORROW.search(question) else "today"
+    session = next((s for s, pattern in SESSION_PATTERNS if pattern.search(question)), None)
+    return day, session
+
+
+def _label(day, session):
+    return f"{day} {SESSION_NAMES[session]}" if session else day
+
+
+def _fmt(row):
+    return f"{row['face_ft']:.1f}ft ({row['rating']})"
+
+
+def _hazard(spots, name):
+    spot_type = spots.get(name, {}).get("type", "")
+    return " Watch out for the reef/rocks." if "reef" in spot_type.lower() else ""
+
+
+def _rows(result):
+    return result if isinstance(result, list) else []
+
+
+def _named_spots(question, spots):
+    """Display names of the spots `question` mentions, by name or pipeline key."""
+    return [
+        name for name, config in spots.items()
+        if re.search(rf"\b({re.escape(name.lower())}|{re.escape(config['key'])})\b", question)
+    ]
+
+
+def answer_fast(question, tools, selected):
+    """
+    Answer `question` from `tools` (ForecastTools), or None. It is about
+    spot `selected` unless it names another one; a question naming
+    several spots is a comparison and goes to the model.
+    """
+    q = question.lower().strip()
+    if len(q.split()) > MAX_WORDS:
+        return None
+    spots = tools.spots
+    named = _named_spots(q, spots)
+    if len(named) > 1:
+        return None
+    if named:
+        selected = named[0]
+    day, session = _when(q)
+    live = day == "today" and session is None
+
+    # Rule 3 of the guide prompt
+    if RE_NIGHT.search(q):
+        morning = [r for r in _rows(tools.find_spots("tomorrow", session="AM")) if r["spot"] == selected]
+        text = "No surfing between 6PM and 6AM; it is not safe in the dark."
+        if morning:
+            text += f" First light at {selected} tomorrow (07:00): {_fmt(morning[0])}."
+        return text
+
+    if RE_BEGINNER.search(q):
+        return _beginner(tools, selected, day, session)
+
+    if RE_BIGGEST.search(q):
+        if live:
+            rows, when = _rows(tools.compare_spots()), "right now"
+        elif session:
+            rows, when = _rows(tools.find_spots(day, session=session)), _label(day, session)
+        else:
+            rows, when = _rows(tools.best_window(day)), day
+        if not rows:
+            return None
+        top = rows[0]
+        text = f"Biggest {when}: {top['spot']} at {_fmt(top)}"
+        if len(rows) > 1:
+            text += f", then {rows[1]['spot']} at {_fmt(rows[1])}"
+        return text + "." + _hazard(spots, top["spot"])
+
+    if RE_BEST_TIME.search(q):
+        rows = _rows(tools.best_window(day, spot=selected))
+        if not rows:
+            return None
+        best = rows[0]
+        return (
+            f"Best session at {selected} {day}: {SESSION_NAMES[best['session']]} ({best['time'][-5:]}) "
+            f"with {_fmt(best)}." + _hazard(spots, selected)
+        )
+
+    if RE_SIZE.search(q):
+        if live:
+            rows = [r for r in _rows(tools.compare_spots()) if r["spot"] == selected]
+            if not rows:
+                return None
+            return f"{selected} right now: {_fmt(rows[0])}." + _hazard(spots, selected)
+        if session:
+            rows = [r for r in _rows(tools.find_spots(day, session=session)) if r["spot"] == selected]
+            if not rows:
+                return None
+            return f"{selected} {_label(day, session)}: {_fmt(rows[0])}." + _hazard(spots, selected)
+        days = tools.daily_forecast(selected, date=day, days=1).get("days")
+        if not days:
+            return None
+        return f"{selected} {days[0]} (face height ft)." + _hazard(spots, selected)
+
+    return None
+
+
+def _beginner(tools, selected, day, session):
+    low, high = BEGINNER_FT
+    when = _label(day, session)
+    if session:
+        rows = [r for r in _rows(tools.find_spots(day, session=session)) if r["spot"] == selected]
+    else:
+        rows = _rows(tools.best_window(day, spot=selected))
+    if not rows:
+        return None
+    here = rows[0]
+    suits = any(r["spot"] == selected for r in tools.list_spots(skill="beginner"))
+
+    if suits and low <= here["face_ft"] <= high:
+        return (
+            f"Yes. {selected} {when}: {_fmt(here)}, inside the {low:.0f}-{high:.0f}ft beginner range."
+            + _hazard(tools.spots, selected)
+        )
+
+    reason = "is not a beginner spot" if not suits else f"will be {_fmt(here)} {when}"
+    options = [
+        r for r in _rows(tools.find_spots(day, session=session, skill="beginner", max_ft=high))
+        if r["face_ft"] >= low and r["spot"] != selected
+    ]
+    text = f"Not ideal: {selected} {reason}."
+    if options:
+        best = options[0]
+        text += f" Try {best['spot']} ({SESSION_NAMES[best['session']]}: {_fmt(best)})." + _hazard(tools.spots, best["spot"])
+    else:
+        text += f" No beginner-friendly spot is in the {low:.0f}-{high:.0f}ft range {when}."
+    return text
@@ -0,0 +1,163 @@
+import json
+
+import pandas as pd
+
+from forecast_post import QUALITY_LABELS, QUALITY_RANK
+from guide_context import spot_summary
+from spots import SKILL_WORDS, suits_skill
+
+DATE_PARAM = {"type": "string", "description": "YYYY-MM-DD, 'today' or 'tomorrow' (Sri Lanka time)"}
+SPOT_PARAM = {"type": "string", "description": "Spot name as returned by list_spots"}
+SKILL_PARAM = {"type": "string", "enum": list(SKILL_WORDS)}
+
+# OpenAI/Groq function-calling schemas
+TOOLS = [
+    {"type": "function", "function": {
+        "name": "list_spots",
+        "description": "All surf spots with break type and difficulty, optionally only those suited to a skill level.",
+        "parameters": {"type": "object", "properties": {"skill": SKILL_PARAM}},
+    }},
+    {"type": "function", "function": {
+        "name": "daily_forecast",
+        "description": "Per-day forecast for one spot: face height (ft) and rating for the AM/MID/PM sessions.",
+        "parameters": {"type": "object", "properties": {
+            "spot": SPOT_PARAM, "date": DATE_PARAM,
+            "days": {"type": "integer", "description": "Number of days from date (default 3)"},
+        }, "required": ["spot"]},
+    }},
+    {"type": "function", "function": {
+        "name": "best_window",
+        "description": "Best daylight session on a date for one spot, or for every spot if spot is omitted.",
+        "parameters": {"type": "object", "properties": {"date": DATE_PARAM, "spot": SPOT_PARAM},
+                       "required": ["date"]},
+    }},
+    {"type": "function", "function": {
+        "name": "find_spots",
+        "description": "Spots matching a skill level and rating range on a date/session, biggest waves first.",
+        "parameters": {"type": "object", "properties": {
+            "date": DATE_PARAM,
+            "session": {"type": "string", "enum": ["AM", "MID", "PM"]},
+            "skill": SKILL_PARAM,
+            "min_quality": {"type": "string", "enum": list(QUALITY_LABELS)},
+            "max_ft": {"type": "number", "description": "Upper limit for face height in ft"},
+        }, "required": ["date"]},
+    }},
+    {"type": "function", "function": {
+        "name": "compare_spots",
+        "description": "Conditions at every spot at one moment (default: now), interpolated between forecast steps.",
+        "parameters": {"type": "object", "properties": {
+            "time": {"type": "string", "description": "YYYY-MM-DD HH:MM (Sri Lanka time); omit for now"},
+        }},
+    }},
+]
+
+
+class ForecastTools:
+    """
+    Forecast queries the AI Guide can call instead of reading tables in its
+    prompt. Backed by the ForecastQuery and the per-run session table, so
+    each call touches only the spots and days it asks about.
+    """
+
+    def __init__(self, query, sessions, spots, now):
+        self.query = query
+        self.sessions = sessions
+        self.spots = spots
+        self.keys = {name: config["key"] for name, config in spots.items()}
+        self.names = {config["key"]: name for name, config in spots.items()}
+        self.now = pd.Timestamp(now)
+        self.schemas = TOOLS
+
+    def _date(self, value):
+        if not value or value == "today":
+            return self.now.date()
+        if value == "tomorrow":
+            return (self.now + pd.Timedelta(days=1)).date()
+        return pd.Timestamp(value).date()
+
+    def _key(self, spot):
+        if spot in self.keys:
+            return self.keys[spot]
+        for name, key in self.keys.items():
+            if spot.lower() in (name.lower(), key):
+                return key
+        raise KeyError(f"Unknown spot {spot!r}")
+
+    def _day(self, date):
+        """Session rows of every spot on one date (one index lookup)."""
+        if self.sessions is None or date not in self.sessions.index.unique('date'):
+            return None
+        return self.sessions.loc[date].reset_index()
+
+    def _row(self, row):
+        return {
+            "spot": self.names.get(row['spot'], row['spot']),
+            "time": f"{row['time']:%a %d %b %H:%M}",
+            "session": row['session'],
+            "face_ft": round(float(row['surf_ft']), 1),
+            "rating": row['quality'],
+            "period_s": round(float(row['tp']), 1) if row['tp'] > 0 else None,
+            "direction": round(float(row['dir'])),
+        }
+
+    def list_spots(self, skill=None):
+        return [
+            {"spot": name, "type": config["type"], "difficulty": config["difficulty"]}
+            for name, config in self.spots.items()
+            if suits_skill(config["difficulty"], skill)
+        ]
+
+    def daily_forecast(self, spot, date=None, days=3):
+        start = self._date(date)
+        lines = [line for day, line in spot_summary(self.sessions, self._key(spot)) if day >= start]
+        return {"spot": spot, "days": lines[:max(1, int(days))]}
+
+    def best_window(self, date, spot=None):
+        day = self._day(self._date(date))
+        if day is None:
+            return {"error": f"No forecast for {date}"}
+        if spot:
+            day = day[day['spot'] == self._key(spot)]
+        best = day.loc[day.groupby('spot')['surf_ft'].idxmax()]
+        return [self._row(r) for _, r in best.sort_values('surf_ft', ascending=False).iterrows()]
+
+    def find_spots(self, date, session=None, skill=None, min_quality=None, max_ft=None):
+        day = self._day(self._date(date))
+        if day is None:
+            return {"error": f"No forecast for {date}"}
+        if session:
+            day = day[day['session'] == session]
+        if skill:
+            allowed = {config["key"] for config in self.spots.values() if suits_skill(config["difficulty"], skill)}
+            day = day[day['spot'].isin(allowed)]
+        if min_quality:
+            floor = QUALITY_RANK.get(min_quality, 0)
+            day = day[day['quality'].map(QUALITY_RANK) >= floor]
+        if max_ft is not None:
+            day = day[day['surf_ft'] <= float(max_ft)]
+        return [self._row(r) for _, r in day.sort_values('surf_ft', ascending=False).iterrows()]
+
+    def compare_spots(self, time=None):
+        when = pd.Timestamp(time) if time else self.now
+        rows = self.query.conditions_all(when)
+        return [
+            {
+                "spot": self.names.get(key, key),
+                "face_ft": round(float(r['surf_ft']), 1),
+                "rating": r['quality'],
+                "period_s": round(float(r['tp']), 1) if r['tp'] > 0 else None,
+                "direction": round(float(r['dir'])),
+            }
+            for key, r in rows.sort_values('surf_ft', ascending=False).iterrows()
+        ]
+
+    def call(self, name, arguments):
+        """Run a tool call from the model; always returns a JSON string."""
+        if name not in {t["function"]["name"] for t in TOOLS}:
+            return json.dumps({"error": f"Unknown tool {name}"})
+        try:
+            kwargs = json.loads(arguments) if isinstance(arguments, str) else dict(arguments or {})
+            result = getattr(self, name)(**kwargs)
+        except (KeyError, TypeError, ValueError) as e:
+            result = {"error": str(e.args[0]) if e.args else str(e)}
+        return json.dumps(result, default=str)
@@ -1,5 +1,12 @@
 import pandas as pd
 import shutil
+import os
+import sys
+
+# Shared SWAN tooling lives one level up in surfspots/
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from swan_config import get_profile, transect_output
 
 TPAR_FILE = "hikkaduwa_boundary.bnd"
 TPAR_COPY = "hikkaduwa_boundary_copy.bnd" 
@@ -11,6 +18,12 @@ XLEN, YLEN = 0.1958, 0.1958
 MX, MY = 47, 47
 DX, DY = 0.004167, 0.004167
 
+# Shore-normal transects for surf-zone profiles, written to one table.
+# {"name", "curve": [(lon, lat), ...], "segments": n} or {"name", "points": [...]}
+TRANSECTS = [
+    {"name": "TRANSECT", "curve": [(80.0000, 6.0000), (80.0900, 6.1200)], "segments": 30},
+]
+
 def get_sim_times(tpar_file):
     try:
         df = pd.read_csv(tpar_file, skiprows=1, delim_whitespace=True, header=None)
@@ -31,13 +44,16 @@ def main():
     start_time, end_time = get_sim_times(TPAR_FILE)
     print(f"   Simulation Range: {start_time} -> {end_time}")
 
+    profile_name, profile = get_profile()
+    print(f"   Numerics Profile: {profile_name}")
+
     swan_code = f"""$ SWAN INPUT: HIKKADUWA (7 DAY / 3 HR)
 PROJECT 'Hikkaduwa' '1'
 MODE NONSTATIONARY
 COORDINATES SPHERICAL
 
 $ 1. GRID
-CGRID REGULAR {XPC} {YPC} 0.0 {XLEN} {YLEN} {MX} {MY} CIRCLE 36 0.05 1.0 24
+CGRID REGULAR {XPC} {YPC} 0.0 {XLEN} {YLEN} {MX} {MY} CIRCLE {profile['dirs']} 0.05 1.0 24
 INPGRID BOTTOM {XPC} {YPC} 0.0 {MX} {MY} {DX} {DY} EXC -99
 READGRID BOTTOM 1 '{BATHY_FILE}' 1 0 FREE
 
@@ -54,7 +70,7 @@ OFF QUAD
 
 $ 4. NUMERICS
 PROP BSBT
-NUMERIC STOPC 0.005 0.005 0.005 95. STAT 15
+{profile['numeric']}
 
 $ 5. OUTPUT
 POINTS 'DEEP' 80.0000 6.0000
@@ -66,8 +82,12 @@ TABLE 'DEEP' HEAD 'deep_forecast.tbl' HS TPS DIR DEPTH QB OUTPUT {start_time} 3
 TABLE 'MID'  HEAD 'mid_forecast.tbl'  HS TPS DIR DEPTH QB OUTPUT {start_time} 3 HR
 TABLE 'SURF' HEAD 'surf_forecast.tbl' HS TPS DIR DEPTH QB OUTPUT {start_time} 3 HR
 
+$ FULL FIELD: Hs/Tp/Dir on the whole grid (binary, read by swan_grid.py)
+BLOCK 'COMPGRID' NOHEAD 'field.mat' LAY 3 XP YP HSIGN TPS DIR OUTPUT {start_time} 3 HR
+
+{transect_output(TRANSECTS, start_time)}
 $ 6. RUN
-COMPUTE {start_time} 15 MIN {end_time}
+COMPUTE {start_time} {profile['step']} {end_time}
 STOP
 """
     with open(INPUT_FILE, "w") as f:
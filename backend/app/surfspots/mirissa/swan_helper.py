@@ -1,15 +1,18 @@
 import os
-import subprocess
 import sys
 
+# Shared SWAN tooling lives one level up in surfspots/
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from swan_watchdog import run_with_retry
+
 def run_swan_in_wsl():
     """
     Translates the current Windows path to a WSL path 
     and executes ./swan.exe inside the Ubuntu environment.
+    The run is watched: hung or too slow runs are killed
+    and retried once with a cheaper profile (coarser directions and step).
     """
-    print(f"--------------------------------------------------")
-    print(" SWAN SIMULATION (Running inside WSL/Ubuntu)...")
-
     # 1. Get current Windows working directory
     cwd = os.getcwd()
     
@@ -22,12 +25,12 @@ def run_swan_in_wsl():
     # 3. Construct the WSL command
     # wsl -e bash -c "cd 'path' && ./swan.exe"
     command = ["wsl", "bash", "-c", f"cd '{wsl_path}' && ./swan.exe"]
+    # Killing the wsl launcher does not always stop swan.exe itself
+    kill_command = ["wsl", "pkill", "-x", "swan.exe"]
 
-    try:
-        # Run the command
-        result = subprocess.run(command, check=True)
+    if run_with_retry(command, kill_command):
         print(" SWAN Simulation Finished Successfully.")
-    except subprocess.CalledProcessError:
+    else:
         print(" STOPPED: Error running ./swan.exe in WSL.")
         print(" Ensure the required libraries are installed and the file is executable.")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -0,0 +1,121 @@
+import hashlib
+import re
+
+import numpy as np
+import pandas as pd
+
+from forecast_data import SL_OFFSET, forecast_versions, load_all
+from forecast_post import QUALITY_RANK
+from forecast_store import publish_ranking
+from spots import SPOTS, suits_skill
+
+# Face height (ft) each level is happiest in; scores fall off outside it
+LEVEL_FT = {
+    "beginner": (2.0, 4.0),
+    "intermediate": (3.0, 6.0),
+    "advanced": (4.0, 10.0),
+}
+LEVELS = list(LEVEL_FT)
+
+WEIGHTS = {"height": 0.45, "quality": 0.25, "period": 0.2, "wind": 0.1}
+PERIOD_RANGE = (6.0, 14.0)  # s: below is wind slop, above scores fully
+UNSUITED = 0.3  # spot difficulty above the surfer's level
+DAYLIGHT = (6, 18)  # Sri Lanka hours; no surfing 6PM-6AM
+
+COMPASS = {
+    "north": 0, "north-east": 45, "east": 90, "south-east": 135,
+    "south": 180, "south-west": 225, "west": 270, "north-west": 315,
+}
+
+
+def parse_wind(best_wind):
+    """'West / South-West' -> [270, 225]"""
+    names = [p.strip().lower() for p in re.split(r"/|,| or ", best_wind or "")]
+    return [COMPASS[n] for n in names if n in COMPASS]
+
+
+def _height_score(ft, lo, hi):
+    # 1 inside [lo, hi], linear to 0 at 0 ft below and at 2*hi above
+    below = np.clip(ft / lo, 0, 1)
+    above = np.clip(1 - (ft - hi) / hi, 0, 1)
+    return np.where(ft < lo, below, np.where(ft > hi, above, 1.0))
+
+
+def rank_spots(frame, spots=SPOTS):
+    """
+    Score every (level, spot, time) row of a load_all frame in one pass and
+    rank spots within each (level, time). Returns a long frame with columns
+    level, time (Sri Lanka), rank, spot, score, surf_ft, quality, tp.
+    A `wind_dir` column, when present, is scored against each spot's
+    best_wind; otherwise the wind term is neutral.
+    """
+    by_key = {config["key"]: config for config in spots.values()}
+    df = frame.reset_index()
+    n = len(df)
+
+    spot_keys, spot_idx = np.unique(df["spot"].values, return_inverse=True)
+    ft = df["surf_ft"].values.astype(np.float64)
+    tp = df["tp"].values.astype(np.float64)
+    quality = df["quality"].map(QUALITY_RANK).fillna(0).values / max(QUALITY_RANK.values())
+    period = np.clip((tp - PERIOD_RANGE[0]) / (PERIOD_RANGE[1] - PERIOD_RANGE[0]), 0, 1)
+    hours = df["time"].dt.hour.values
+    daylight = (hours >= DAYLIGHT[0]) & (hours < DAYLIGHT[1])
+
+    wind = np.full(n, 0.5)
+    if "wind_dir" in df:
+        for i, key in enumerate(spot_keys):
+            best = parse_wind(by_key.get(key, {}).get("best_wind"))
+            rows = spot_idx == i
+            if best:
+                diff = np.abs((df["wind_dir"].values[rows, None] - np.array(best)[None, :] + 180) % 360 - 180)
+                wind[rows] = (1 + np.cos(np.radians(diff.min(axis=1)))) / 2
+
+    # (level, spot) suitability from the SPOTS difficulty labels
+    suit = np.array([
+        [1.0 if suits_skill(by_key.get(key, {}).get("difficulty", ""), level) else UNSUITED for key in spot_keys]
+        for level in LEVELS
+    ])
+
+    lo = np.array([LEVEL_FT[level][0] for level in LEVELS])[:, None]
+    hi = np.array([LEVEL_FT[level][1] for level in LEVELS])[:, None]
+    height = _height_score(ft[None, :], lo, hi)  # (level, row)
+    base = WEIGHTS["quality"] * quality + WEIGHTS["period"] * period + WEIGHTS["wind"] * wind
+    score = 100 * (WEIGHTS["height"] * height + base[None, :]) * suit[:, spot_idx] * daylight[None, :]
+
+    level_idx = np.repeat(np.arange(len(LEVELS)), n)
+    times = np.tile(df["time"].values.astype("datetime64[ns]").astype(np.int64), len(LEVELS))
+    flat = score.ravel()
+    # Sort by level, time, then score (best first), and number rows per group
+    order = np.lexsort((-flat, times, level_idx))
+    group = np.r_[True, (np.diff(level_idx[order]) != 0) | (np.diff(times[order]) != 0)]
+    starts = np.flatnonzero(group)
+    rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)])) + 1
+
+    rows = np.tile(np.arange(n), len(LEVELS))[order]
+    return pd.DataFrame({
+        "level": np.array(LEVELS)[level_idx[order]],
+        "time": df["time"].values[rows],
+        "rank": rank,
+        "spot": df["spot"].values[rows],
+        "score": flat[order].round(1),
+        "surf_ft": ft[rows],
+        "quality": df["quality"].values[rows],
+        "tp": tp[rows],
+    })
+
+
+def ranking_key(versions):
+    """Short id of the forecast_versions a ranking was computed from."""
+    return hashlib.sha1(repr(versions).encode()).hexdigest()[:16]
+
+
+def publish_latest_ranking(spots=SPOTS):
+    """Rank the latest forecast of every spot and publish it to the store."""
+    files = {config["key"]: config["path"] for config in spots.values()}
+    frame = load_all(files)
+    if frame is None:
+        return 0
+    version = ranking_key(forecast_versions(files))
+    ranked = rank_spots(frame, spots)
+    # The store keeps UTC like the forecast table
+    return publish_ranking(ranked.assign(time=ranked["time"] - SL_OFFSET), version)
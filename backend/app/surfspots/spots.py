@@ -0,0 +1,49 @@
+# Spot catalogue shared by the dashboard, the AI guide and the ranking.
+# "key" is the pipeline folder; paths are relative to surfspots/.
+SPOTS = {
+    "Arugam Bay": {
+        "key": "arugambay",
+        "path": "arugambay/arugambay_forecast.json",
+        "transect": "arugambay/arugambay_transect.json",
+        "type": "Point Break",
+        "difficulty": "Intermediate to Expert",
+        "best_wind": "West / South-West"
+    },
+    "Ahangama": {
+        "key": "ahangama",
+        "path": "ahangama/ahangama_forecast.json",
+        "transect": "ahangama/ahangama_transect.json",
+        "type": "Reef Break",
+        "difficulty": "Intermediate",
+        "best_wind": "North / North-East"
+    },
+    "Mirissa": {
+        "key": "mirissa",
+        "path": "mirissa/mirissa_forecast.json",
+        "transect": "mirissa/mirissa_transect.json",
+        "type": "Point/Reef",
+        "difficulty": "All Levels",
+        "best_wind": "North"
+    },
+    "Hikkaduwa": {
+        "key": "hikkaduwa",
+        "path": "hikkaduwa/hikkaduwa_forecast.json",
+        "transect": "hikkaduwa/hikkaduwa_transect.json",
+        "type": "Reef Break",
+        "difficulty": "Advanced (Main Reef)",
+        "best_wind": "North-East"
+    }
+}
+
+
+# Which SPOTS difficulty labels suit each skill level
+SKILL_WORDS = {
+    "beginner": ("beginner", "all levels"),
+    "intermediate": ("beginner", "all levels", "intermediate"),
+    "advanced": None,  # every spot
+}
+
+
+def suits_skill(difficulty, skill):
+    words = SKILL_WORDS.get((skill or "advanced").lower())
+    return words is None or any(w in difficulty.lower() for w in words)
@@ -0,0 +1,191 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+GROQ_MODEL = "llama-3.3-70b-versatile"
+TEMPERATURE = 0.3  # Low temp for strict adherence to data
+MAX_TOKENS = 250
+MAX_TOOL_ROUNDS = 3
+
+CACHE_SIZE = int(os.getenv("GUIDE_CACHE_SIZE", 256))
+CACHE_TTL = int(os.getenv("GUIDE_CACHE_TTL", 1800))
+
+
+class LLMClient:
+    """
+    Minimal chat interface: stream(messages, tools) yields text chunks and
+    returns the tool calls the model made instead of answering, as
+    [{"id", "name", "arguments"}] ([] once it has answered).
+    """
+
+    def stream(self, messages, tools=None):
+        raise NotImplementedError
+
+
+class GroqClient(LLMClient):
+    def __init__(self, api_key, model=GROQ_MODEL, temperature=TEMPERATURE, max_tokens=MAX_TOKENS):
+        from groq import Groq
+        self.client = Groq(api_key=api_key)
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+
+    def stream(self, messages, tools=None):
+        params = {"tools": tools, "tool_choice": "auto"} if tools else {}
+        completion = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            stream=True,
+            **params,
+        )
+        calls = {}
+        for chunk in completion:
+            delta = chunk.choices[0].delta
+            if delta.content:
+                yield delta.content
+            # Tool calls arrive in pieces, keyed by their index
+            for part in delta.tool_calls or []:
+                call = calls.setdefault(part.index, {"id": None, "name": "", "arguments": ""})
+                call["id"] = part.id or call["id"]
+                if part.function:
+                    call["name"] += part.function.name or ""
+                    call["arguments"] += part.function.arguments or ""
+        return [calls[i] for i in sorted(calls)]
+
+
+class LocalClient(LLMClient):
+    """
+    Stand-in model for tests and offline runs: replies with `reply` (or the
+    result of `reply(messages)`) word by word, like a streamed completion.
+    `tool_calls` is a list of (name, arguments) made on the first stream()
+    with tools of a conversation, before answering.
+    """
+
+    def __init__(self, reply="Conditions look fine.", delay=0.0, tool_calls=None):
+        self.reply = reply
+        self.delay = delay
+        self.tool_calls = tool_calls or []
+        self.calls = 0
+
+    def stream(self, messages, tools=None):
+        self.calls += 1
+        if tools and self.tool_calls and messages[-1]["role"] != "tool":
+            return [
+                {"id": f"call_{i}", "name": name, "arguments": json.dumps(args)}
+                for i, (name, args) in enumerate(self.tool_calls)
+            ]
+        text = self.reply(messages) if callable(self.reply) else self.reply
+        for word in re.findall(r"\S+\s*", text):
+            if self.delay:
+                time.sleep(self.delay)
+            yield word
+        return []
+
+
+def normalize_question(question):
+    """Case, spacing and trailing punctuation do not make a new question."""
+    return re.sub(r"\s+", " ", question.lower()).strip().rstrip("?!. ")
+
+
+class AnswerCache:
+    """
+    Thread-safe LRU of finished answers with a TTL.
+    Keys are (spot, every spot's forecast version, Sri Lanka hour,
+    normalized question): answers can draw on any spot through the tools,
+    so a new run anywhere invalidates them, and "now"/"today" answers
+    never outlive the hour (or day) they were written in.
+    """
+
+    def __init__(self, max_entries=CACHE_SIZE, ttl=CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(spot, versions, now, question):
+        return spot, versions, now.strftime("%Y-%m-%d %H"), normalize_question(question)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, answer):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), answer)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def answer_with_tools(client, messages, toolbox, max_rounds=MAX_TOOL_ROUNDS):
+    """
+    Let the model fetch what it needs through `toolbox` (schemas + call()),
+    streaming its answer from the same completion once it stops calling
+    tools. If it is still calling tools after `max_rounds`, the answer is
+    streamed from what it has fetched so far.
+    """
+    messages = list(messages)
+    for _ in range(max_rounds):
+        chunks = client.stream(messages, tools=toolbox.schemas)
+        content = []
+        while True:
+            try:
+                text = next(chunks)
+            except StopIteration as done:
+                calls = done.value or []
+                break
+            content.append(text)
+            yield text
+        if not calls:
+            if content:
+                return
+            break
+        messages.append({
+            "role": "assistant",
+            "content": "".join(content),
+            "tool_calls": [
+                {"id": c["id"], "type": "function", "function": {"name": c["name"], "arguments": c["arguments"]}}
+                for c in calls
+            ],
+        })
+        for c in calls:
+            messages.append({"role": "tool", "tool_call_id": c["id"], "content": toolbox.call(c["name"], c["arguments"])})
+    yield from client.stream(messages)
+
+
+def stream_answer(client, cache, key, messages, toolbox=None):
+    """
+    Yield the answer text as it arrives. A cached answer is yielded in one
+    piece; a fresh one is cached only once the stream has completed.
+    With a `toolbox` the model answers through forecast tool calls.
+    """
+    cached = cache.get(key)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    chunks = answer_with_tools(client, messages, toolbox) if toolbox else client.stream(messages)
+    for text in chunks:
+        parts.append(text)
+        yield text
+    cache.put(key, "".join(parts))
@@ -0,0 +1,68 @@
+import json
+import os
+
+# Numerical settings used when writing INPUT.
+# "fast" trades directional/time resolution for speed and is what the
+# watchdog falls back to when a normal run is aborted. The runs are
+# NONSTATIONARY (one iteration per step), so STOPC/STAT do not change
+# their cost and both profiles share the same NUMERIC line.
+NUMERIC = "NUMERIC STOPC 0.005 0.005 0.005 95. STAT 15"
+
+PROFILES = {
+    "default": {"dirs": 36, "step": "15 MIN", "numeric": NUMERIC},
+    "fast": {"dirs": 24, "step": "30 MIN", "numeric": NUMERIC},
+}
+
+def get_profile(name=None):
+    name = name or os.getenv("SWAN_PROFILE", "default")
+    if name not in PROFILES:
+        print(f" Unknown SWAN profile '{name}', using default.")
+        name = "default"
+    return name, PROFILES[name]
+
+
+# Extra output locations (POINTS or CURVE) are flattened into one point set
+# so SWAN writes them to a single table; the point list is saved alongside
+# so swan_table can split it back into named transects.
+TRANSECT_SET = "TRANSECT"
+TRANSECT_TABLE = "transect.tbl"
+TRANSECT_POINTS = "transect_points.json"
+
+def expand_output(output):
+    """
+    {"name", "points": [(lon, lat), ...]} -> the points as given.
+    {"name", "curve": [(lon, lat), ...], "segments": n} -> n equal steps
+    between consecutive vertices, like SWAN's CURVE command.
+    """
+    if "points" in output:
+        return [tuple(p) for p in output["points"]]
+    vertices = output["curve"]
+    segments = output.get("segments", 10)
+    coords = [tuple(vertices[0])]
+    for (x0, y0), (x1, y1) in zip(vertices, vertices[1:]):
+        for k in range(1, segments + 1):
+            f = k / segments
+            coords.append((x0 + (x1 - x0) * f, y0 + (y1 - y0) * f))
+    return coords
+
+def transect_output(outputs, start_time, interval="3 HR"):
+    """INPUT lines for all declared outputs in one TABLE; writes TRANSECT_POINTS."""
+    if not outputs:
+        return ""
+
+    points = []
+    for output in outputs:
+        for lon, lat in expand_output(output):
+            points.append({"output": output["name"], "lon": round(lon, 6), "lat": round(lat, 6)})
+
+    with open(TRANSECT_POINTS, "w") as f:
+        json.dump(points, f)
+
+    # One coordinate pair per line ('&' continues the command in SWAN)
+    coords = " &\n".join(f"    {p['lon']:.6f} {p['lat']:.6f}" for p in points)
+    names = ", ".join(o["name"] for o in outputs)
+    return (
+        f"$ TRANSECTS: {names} ({len(points)} points, one table)\n"
+        f"POINTS '{TRANSECT_SET}' &\n{coords}\n"
+        f"TABLE '{TRANSECT_SET}' HEAD '{TRANSECT_TABLE}' HS TPS DIR DEPTH QB OUTPUT {start_time} {interval}\n"
+    )
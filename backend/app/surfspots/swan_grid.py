@@ -0,0 +1,174 @@
+import json
+import os
+import re
+import struct
+from datetime import datetime
+
+import numpy as np
+
+FIELD_MAT = "field.mat"
+FIELD_DIR = "field"
+
+# SWAN .mat variable prefix -> our array name
+VARIABLES = {"Hsig": "hs", "TPsmoo": "tp", "Dir": "dir"}
+
+# MAT-file level 5 data types
+MI_INT8, MI_INT32, MI_UINT32, MI_SINGLE, MI_DOUBLE, MI_MATRIX = 1, 5, 6, 7, 9, 14
+NP_TYPES = {
+    1: np.int8, 2: np.uint8, 3: np.int16, 4: np.uint16, 5: np.int32,
+    6: np.uint32, 7: np.float32, 9: np.float64, 12: np.int64, 13: np.uint64,
+}
+
+RE_TIMED = re.compile(r"^(\w+?)_(\d{8}_\d{6})$")
+
+
+def _read_tag(f):
+    raw = f.read(8)
+    if len(raw) < 8:
+        return None
+    dtype, nbytes = struct.unpack("<II", raw)
+    if dtype >> 16:
+        # Small data element: type, size and up to 4 bytes of data in one tag
+        return dtype & 0xFFFF, dtype >> 16, raw[4:4 + (dtype >> 16)]
+    return dtype, nbytes, None
+
+
+def scan_mat(path):
+    """
+    Yield (name, shape, dtype, offset) for every 2-D matrix in a SWAN
+    level 5 .mat file without reading the data itself.
+    SWAN writes uncompressed files, so each matrix is one contiguous block.
+    """
+    with open(path, "rb") as f:
+        f.seek(128)
+        while True:
+            tag = _read_tag(f)
+            if tag is None:
+                return
+            dtype, nbytes, _ = tag
+            end = f.tell() + nbytes + (-nbytes % 8)
+            if dtype != MI_MATRIX:
+                f.seek(end)
+                continue
+
+            _read_tag(f)
+            f.read(8)  # array flags
+            _, dims_bytes, _ = _read_tag(f)
+            dims = struct.unpack(f"<{dims_bytes // 4}i", f.read(dims_bytes))
+            f.read(-dims_bytes % 8)
+
+            _, name_bytes, small = _read_tag(f)
+            if small is not None:
+                name = small.decode("ascii")
+            else:
+                name = f.read(name_bytes).decode("ascii")
+                f.read(-name_bytes % 8)
+
+            data_type, _, _ = _read_tag(f)
+            yield name, dims, NP_TYPES[data_type], f.tell()
+            f.seek(end)
+
+
+def _read_matrix(path, shape, dtype, offset):
+    # MATLAB stores column-major; (rows, cols) == (y, x)
+    data = np.fromfile(path, dtype=dtype, count=shape[0] * shape[1], offset=offset)
+    return data.reshape(shape, order="F")
+
+
+def convert_block(mat_file=FIELD_MAT, out_dir=FIELD_DIR):
+    """
+    Convert SWAN BLOCK output (.mat) into one float32 .npy file per
+    variable, shaped (time, y, x), plus lon/lat axes and the time list.
+    Arrays are written through memory maps so the full field is never in RAM.
+    """
+    if not os.path.exists(mat_file):
+        print(f" No gridded output found ({mat_file}).")
+        return None
+
+    entries = list(scan_mat(mat_file))
+    os.makedirs(out_dir, exist_ok=True)
+
+    axes = {name: entry for name, *entry in entries if name in ("Xp", "Yp")}
+    timed = {}
+    for name, shape, dtype, offset in entries:
+        m = RE_TIMED.match(name)
+        if m and m.group(1) in VARIABLES:
+            timed.setdefault(m.group(1), []).append((m.group(2), shape, dtype, offset))
+
+    if not timed:
+        print(f" No Hs/Tp/Dir fields in {mat_file}.")
+        return None
+
+    times = sorted({stamp for fields in timed.values() for stamp, *_ in fields})
+    index = {stamp: i for i, stamp in enumerate(times)}
+    shape = next(iter(timed.values()))[0][1]
+
+    for swan_name, fields in timed.items():
+        target = np.lib.format.open_memmap(
+            os.path.join(out_dir, f"{VARIABLES[swan_name]}.npy"),
+            mode="w+", dtype=np.float32, shape=(len(times),) + tuple(shape),
+        )
+        target[:] = np.nan
+        for stamp, fshape, dtype, offset in fields:
+            target[index[stamp]] = _read_matrix(mat_file, fshape, dtype, offset)
+        target.flush()
+        del target
+
+    if "Xp" in axes and "Yp" in axes:
+        lon = _read_matrix(mat_file, *axes["Xp"])[0, :]
+        lat = _read_matrix(mat_file, *axes["Yp"])[:, 0]
+        np.save(os.path.join(out_dir, "lon.npy"), lon.astype(np.float64))
+        np.save(os.path.join(out_dir, "lat.npy"), lat.astype(np.float64))
+
+    iso_times = [datetime.strptime(t, "%Y%m%d_%H%M%S").strftime("%Y-%m-%d %H:%M:%S") for t in times]
+    with open(os.path.join(out_dir, "times.json"), "w") as f:
+        json.dump(iso_times, f)
+
+    print(f" Gridded output: {len(times)} steps x {shape[0]}x{shape[1]} cells -> {out_dir}/")
+    return out_dir
+
+
+class GridField:
+    """
+    Read-only view of converted BLOCK output.
+    hs/tp/dir are memory-mapped (time, y, x) arrays, so picking a point,
+    transect or single map only touches the pages it needs.
+    """
+
+    def __init__(self, out_dir=FIELD_DIR):
+        self.out_dir = out_dir
+        with open(os.path.join(out_dir, "times.json")) as f:
+            self.times = np.array(json.load(f), dtype="datetime64[s]")
+        self.lon = np.load(os.path.join(out_dir, "lon.npy"))
+        self.lat = np.load(os.path.join(out_dir, "lat.npy"))
+        self.fields = {}
+        for name in VARIABLES.values():
+            path = os.path.join(out_dir, f"{name}.npy")
+            if os.path.exists(path):
+                self.fields[name] = np.load(path, mmap_mode="r")
+
+    def __getitem__(self, name):
+        return self.fields[name]
+
+    def cell(self, lon, lat):
+        """Nearest (iy, ix) grid cell for a coordinate inside the domain."""
+        if not (self.lon.min() <= lon <= self.lon.max() and self.lat.min() <= lat <= self.lat.max()):
+            raise ValueError(f"({lon}, {lat}) is outside the computational grid")
+        return int(np.abs(self.lat - lat).argmin()), int(np.abs(self.lon - lon).argmin())
+
+    def point(self, lon, lat):
+        """Time series of every variable at the nearest cell."""
+        iy, ix = self.cell(lon, lat)
+        return {name: np.asarray(arr[:, iy, ix]) for name, arr in self.fields.items()}
+
+    def transect(self, start, end, n=20, var="hs"):
+        """(time, n) samples along the straight line start -> end (lon, lat)."""
+        lons = np.linspace(start[0], end[0], n)
+        lats = np.linspace(start[1], end[1], n)
+        iy = np.abs(self.lat[None, :] - lats[:, None]).argmin(axis=1)
+        ix = np.abs(self.lon[None, :] - lons[:, None]).argmin(axis=1)
+        return np.asarray(self.fields[var][:, iy, ix])
+
+    def frame(self, var="hs", step=0):
+        """One (y, x) map, e.g. for a heatmap."""
+        return np.asarray(self.fields[var][step])
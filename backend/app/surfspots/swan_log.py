@@ -0,0 +1,247 @@
+import glob
+import gzip
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+PRINT_FILE = "PRINT"
+METRICS_FILE = "swan_runs.jsonl"
+LOG_DIR = "logs"
+KEEP_LOGS = 5
+
+RE_COMPUTE = re.compile(r"^\s*COMPUTE\s+(\d{8}\.\d*)\s+([\d.]+)\s+(SEC|MIN|HR|DAY)\s+(\d{8}\.\d*)", re.I)
+RE_TIME = re.compile(r"Time of computation\s*->\s*(\d{8}\.\d*)\s+in sec:\s*([\d.]+)")
+RE_ITER = re.compile(r"^\s*\+?iteration\s+(\d+)", re.I)
+RE_ACCURACY = re.compile(r"accuracy OK in\s+([\d.]+)\s*%.*?\(\s*([\d.]+)\s*%\s*required", re.I)
+RE_NO_ACCURACY = re.compile(r"not possible to compute, first iteration", re.I)
+RE_MESSAGE = re.compile(r"^\s*\*\*\s*(warning|error|severe error)\s*:\s*(.*?)\s*$", re.I)
+
+UNIT_SECONDS = {"SEC": 1, "MIN": 60, "HR": 3600, "DAY": 86400}
+
+
+def parse_swan_time(stamp):
+    """SWAN writes 20251124.0 / 20251124.1800 / 20251124.001500 -> datetime."""
+    date, _, clock = stamp.partition(".")
+    clock = (clock + "000000")[:6]
+    return datetime.strptime(date + clock, "%Y%m%d%H%M%S")
+
+
+class PrintLogParser:
+    """
+    Incremental parser for the SWAN PRINT file.
+    Feed it lines as SWAN writes them; it keeps one small record per
+    time step instead of the text, so it is cheap to run during a run.
+    """
+
+    def __init__(self):
+        self.start_time = None
+        self.end_time = None
+        self.step_seconds = None
+        self.total_seconds = None
+        self.sim_seconds = 0.0
+        # One [sim_seconds, iterations, accuracy %] entry per time step
+        self.steps = []
+        self.required_accuracy = None
+        self.warnings = Counter()
+        self.errors = Counter()
+        self.finished = False
+        self.lines = 0
+
+    def feed(self, line):
+        self.lines += 1
+
+        m = RE_TIME.search(line)
+        if m:
+            self.sim_seconds = float(m.group(2))
+            self.steps.append([self.sim_seconds, 0, None])
+            return
+
+        m = RE_ITER.match(line)
+        if m and self.steps:
+            self.steps[-1][1] = max(self.steps[-1][1], int(m.group(1)))
+            return
+
+        if RE_NO_ACCURACY.search(line):
+            if self.steps:
+                self.steps[-1][1] = max(self.steps[-1][1], 1)
+            return
+
+        m = RE_ACCURACY.search(line)
+        if m:
+            self.required_accuracy = float(m.group(2))
+            if self.steps:
+                self.steps[-1][2] = float(m.group(1))
+            return
+
+        m = RE_MESSAGE.match(line)
+        if m:
+            kind, text = m.group(1).lower(), m.group(2)
+            if kind == "warning":
+                self.warnings[text] += 1
+            else:
+                self.errors[text] += 1
+            return
+
+        m = RE_COMPUTE.match(line)
+        if m:
+            self.start_time = parse_swan_time(m.group(1))
+            self.end_time = parse_swan_time(m.group(4))
+            self.step_seconds = float(m.group(2)) * UNIT_SECONDS[m.group(3).upper()]
+            self.total_seconds = (self.end_time - self.start_time).total_seconds()
+            return
+
+        if line.strip() == "STOP":
+            self.finished = True
+
+    @property
+    def progress(self):
+        if not self.total_seconds:
+            return 0.0
+        return min(1.0, self.sim_seconds / self.total_seconds)
+
+    @property
+    def current_time(self):
+        if self.start_time is None:
+            return None
+        return self.start_time + timedelta(seconds=self.sim_seconds)
+
+    def non_converged_steps(self):
+        """
+        Steps below the required accuracy. SWAN only prints "accuracy OK"
+        for stationary runs; NONSTATIONARY runs with one iteration per
+        step never report it, and this stays 0.
+        """
+        if self.required_accuracy is None:
+            return 0
+        return sum(1 for _, _, acc in self.steps if acc is not None and acc < self.required_accuracy)
+
+    def summary(self):
+        iterations = [it for _, it, _ in self.steps]
+        accuracy = [acc for _, _, acc in self.steps if acc is not None]
+        return {
+            "start": self.start_time.strftime("%Y-%m-%d %H:%M:%S") if self.start_time else None,
+            "end": self.end_time.strftime("%Y-%m-%d %H:%M:%S") if self.end_time else None,
+            "finished": self.finished,
+            "progress": round(self.progress, 4),
+            "steps": len(self.steps),
+            "iterations_total": sum(iterations),
+            "iterations_max": max(iterations) if iterations else 0,
+            "accuracy_min": min(accuracy) if accuracy else None,
+            "accuracy_mean": round(sum(accuracy) / len(accuracy), 2) if accuracy else None,
+            "accuracy_required": self.required_accuracy,
+            "non_converged_steps": self.non_converged_steps(),
+            "warnings": dict(self.warnings),
+            "errors": dict(self.errors),
+            "print_lines": self.lines,
+        }
+
+
+def follow(path, parser, stop_event, poll=0.5):
+    """
+    Tail `path` into `parser` until `stop_event` is set.
+    Waits for the file to appear and restarts if SWAN truncates it.
+    """
+    f = None
+    position = 0
+    pending = ""
+    try:
+        while True:
+            if f is None:
+                if os.path.exists(path):
+                    f = open(path, "r", errors="replace")
+                    position = 0
+                elif stop_event.is_set():
+                    return
+                else:
+                    time.sleep(poll)
+                    continue
+
+            if os.path.exists(path) and os.path.getsize(path) < position:
+                # File was rewritten from scratch
+                f.seek(0)
+                position = 0
+                pending = ""
+
+            chunk = f.read()
+            if chunk:
+                position = f.tell()
+                chunk = pending + chunk
+                lines = chunk.split("\n")
+                pending = lines.pop()
+                for line in lines:
+                    parser.feed(line)
+            elif stop_event.is_set():
+                if pending:
+                    parser.feed(pending)
+                return
+            else:
+                time.sleep(poll)
+    finally:
+        if f is not None:
+            f.close()
+
+
+class PrintMonitor(threading.Thread):
+    """Background thread that follows PRINT while SWAN is running."""
+
+    def __init__(self, path=PRINT_FILE, poll=0.5):
+        super().__init__(daemon=True)
+        self.path = path
+        self.poll = poll
+        self.parser = PrintLogParser()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        follow(self.path, self.parser, self._stop_event, self.poll)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def save_run_metrics(parser, wall_seconds, returncode=0, abort_reason=None, metrics_file=METRICS_FILE):
+    """Append a one-line metrics record for this run and return it."""
+    record = {
+        "run_at": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+        "wall_seconds": round(wall_seconds, 1),
+        "returncode": returncode,
+        "abort_reason": abort_reason,
+    }
+    record.update(parser.summary())
+    with open(metrics_file, "a") as f:
+        f.write(json.dumps(record) + "\n")
+    return record
+
+
+def rotate_print(path=PRINT_FILE, log_dir=LOG_DIR, keep=KEEP_LOGS):
+    """Gzip the raw PRINT file into log_dir and keep only the newest `keep`."""
+    if not os.path.exists(path):
+        return None
+
+    os.makedirs(log_dir, exist_ok=True)
+    stamp = datetime.utcfromtimestamp(os.path.getmtime(path)).strftime("%Y%m%d.%H%M%S")
+    target = os.path.join(log_dir, f"{os.path.basename(path)}.{stamp}.gz")
+
+    with open(path, "rb") as src, gzip.open(target, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(path)
+
+    archived = sorted(glob.glob(os.path.join(log_dir, f"{os.path.basename(path)}.*.gz")))
+    for old in archived[:-keep]:
+        os.remove(old)
+    return target
+
+
+def parse_print_file(path=PRINT_FILE):
+    """Parse a finished (plain or gzipped) PRINT file in one pass."""
+    parser = PrintLogParser()
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", errors="replace") as f:
+        for line in f:
+            parser.feed(line.rstrip("\n"))
+    return parser
@@ -0,0 +1,273 @@
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from swan_config import TRANSECT_POINTS, TRANSECT_SET
+from swan_log import UNIT_SECONDS, parse_swan_time
+
+INPUT_FILE = "INPUT"
+
+# SWAN header names -> names used by the forecast scripts
+COLUMN_ALIASES = {"Hsig": "Hs", "TPsmoo": "Tp", "Dir": "Dir", "Depth": "Depth", "Qb": "QB"}
+
+RE_POINTS = re.compile(r"^POINTS\s+'([^']+)'\s+(.*)$", re.I)
+RE_TABLE = re.compile(
+    r"^TABLE\s+'([^']+)'\s+\w+\s+'([^']+)'.*?\bOUTPUT\s+(\d{8}\.\d*)\s+([\d.]+)\s+(SEC|MIN|HR|DAY)", re.I
+)
+RE_UNITS = re.compile(r"\[[^\]]*\]")
+
+
+def parse_input(input_file=INPUT_FILE):
+    """
+    Read point sets and TABLE requests from a SWAN INPUT file.
+    Returns ({set name: [(lon, lat), ...]}, [table dicts in file order]).
+    """
+    points, tables = {}, []
+    with open(input_file) as f:
+        text = f.read()
+    # Join continuation lines ('&' or '_' at the end of a line)
+    lines, pending = [], ""
+    for raw in text.splitlines():
+        line = raw.split("$", 1)[0].strip()
+        if line.endswith(("&", "_")):
+            pending += line[:-1] + " "
+            continue
+        lines.append(pending + line)
+        pending = ""
+
+    for line in lines:
+        m = RE_POINTS.match(line)
+        if m:
+            coords = [float(v) for v in m.group(2).split()]
+            points[m.group(1)] = list(zip(coords[0::2], coords[1::2]))
+            continue
+        m = RE_TABLE.match(line)
+        if m:
+            tables.append({
+                "set": m.group(1),
+                "file": m.group(2),
+                "start": parse_swan_time(m.group(3)),
+                "interval": float(m.group(4)) * UNIT_SECONDS[m.group(5).upper()],
+            })
+    return points, tables
+
+
+def _split_header(raw):
+    """Return (column names, units, byte offset of the first data row)."""
+    names, units, offset = [], [], 0
+    header = []
+    while raw.startswith(b"%", offset):
+        end = raw.find(b"\n", offset)
+        end = len(raw) if end < 0 else end + 1
+        header.append(raw[offset:end].decode("ascii", "replace").lstrip("%").strip())
+        offset = end
+
+    for i, line in enumerate(header):
+        found = RE_UNITS.findall(line)
+        if found and i > 0 and RE_UNITS.sub("", line).strip() == "":
+            names = header[i - 1].split()
+            units = [u.strip("[] ") for u in found]
+            break
+    if not names:
+        raise ValueError("No column header found in SWAN table")
+    return names, units, offset
+
+
+def _parse_fixed(body, ncols):
+    """
+    Parse fixed-width numeric rows without going through Python floats.
+    SWAN writes every row with the same width and decimal position, so each
+    column is rebuilt from its digit bytes with a few vector operations.
+    Returns None if the block does not look like that.
+    """
+    line_len = body.find(b"\n") + 1
+    if line_len <= 0:
+        return None
+    # The last row may have lost its trailing blanks; pad it back to width
+    remainder = len(body) % line_len
+    if remainder:
+        body = body[:-1] + b" " * (line_len - remainder) + b"\n"
+    n = len(body) // line_len
+    rows = np.frombuffer(body, dtype=np.uint8).reshape(n, line_len)
+    if not (rows[:, -1] == 10).all():
+        return None
+
+    first = body[:line_len]
+    spans = [m.span() for m in re.finditer(rb"\S+", first)]
+    if len(spans) != ncols:
+        return None
+    # Letters mean exponents or NaN (1.0E+02), which need the slow path
+    if rows.max() > 57:
+        return None
+
+    cols = np.ascontiguousarray(rows.T)
+    blank = (cols == 32).all(axis=1)
+    out = np.zeros((ncols, n), dtype=np.float64)
+    start = 0
+    for k, (_, end) in enumerate(spans):
+        token = first[start:end]
+        if b"." not in token:
+            return None
+        dot = start + token.index(b".")
+        if not (cols[dot] == 46).all():
+            return None
+
+        acc = out[k]
+        negative = None
+        for j in range(start, end):
+            if j == dot or blank[j]:
+                continue
+            c = cols[j]
+            acc *= 10
+            acc += np.maximum(c, 48) - 48
+            minus = c == 45
+            if minus.any():
+                negative = minus if negative is None else negative | minus
+        acc /= 10.0 ** (end - dot - 1)
+        if negative is not None:
+            acc[negative] *= -1
+        start = end
+
+    return out.T
+
+
+def read_table(path):
+    """Read one SWAN TABLE file -> (names, units, float64 array (rows, cols))."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    names, units, offset = _split_header(raw)
+    body = raw[offset:].rstrip() + b"\n"
+    if body == b"\n":
+        return names, units, np.empty((0, len(names)), dtype=np.float64)
+
+    data = _parse_fixed(body, len(names))
+    if data is None:
+        data = np.array(body.split(), dtype=np.float64).reshape(-1, len(names))
+    return names, units, data
+
+
+def along_track_km(coords):
+    """Cumulative great-circle distance (km) along a list of (lon, lat)."""
+    lon, lat = np.radians(np.asarray(coords, dtype=np.float64)).T
+    dlat, dlon = np.diff(lat), np.diff(lon)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(dlon / 2) ** 2
+    return np.concatenate([[0.0], np.cumsum(2 * 6371.0 * np.arcsin(np.sqrt(a)))])
+
+
+class SwanTables:
+    """
+    All TABLE output of one run in a single float64 array shaped
+    (time, point, column), with output times taken from the INPUT schedule.
+    `groups` maps each point set / transect name to its slice of points.
+    """
+
+    def __init__(self, times, points, columns, units, data, coords=None, groups=None, transects=None):
+        self.times = times
+        self.points = points
+        self.columns = columns
+        self.units = units
+        self.data = data
+        self.coords = coords or [None] * len(points)
+        self.groups = groups or {}
+        self.transects = transects or []
+        self._point_index = {p: i for i, p in enumerate(points)}
+        self._column_index = {c: i for i, c in enumerate(columns)}
+        for swan_name, alias in COLUMN_ALIASES.items():
+            if swan_name in self._column_index:
+                self._column_index.setdefault(alias, self._column_index[swan_name])
+
+    def __len__(self):
+        return len(self.times)
+
+    def get(self, point, column):
+        return self.data[:, self._point_index[point], self._column_index[column]]
+
+    def to_frame(self, point):
+        frame = pd.DataFrame(
+            self.data[:, self._point_index[point], :],
+            columns=[COLUMN_ALIASES.get(c, c) for c in self.columns],
+        )
+        frame.insert(0, "time", pd.to_datetime(self.times))
+        return frame
+
+    def profile(self, name, column):
+        """(time, point) values along a transect; SWAN exception values -> NaN."""
+        values = self.data[:, self.groups[name], self._column_index[column]]
+        return np.where(values < 0, np.nan, values)
+
+    def transect(self, name):
+        """Everything needed to draw a transect profile for each output time."""
+        coords = self.coords[self.groups[name]]
+        result = {
+            "times": [str(t) for t in self.times.astype("datetime64[s]")],
+            "lon": [c[0] for c in coords],
+            "lat": [c[1] for c in coords],
+            "distance_km": along_track_km(coords).round(3).tolist(),
+        }
+        for column in ("Hs", "Tp", "Dir", "Depth", "QB"):
+            if column in self._column_index:
+                values = self.profile(name, column).round(4)
+                result[column.lower()] = np.where(np.isnan(values), None, values).tolist()
+        return result
+
+
+def read_tables(input_file=INPUT_FILE):
+    """
+    Read every TABLE requested in INPUT in one call.
+    Multi-point sets are split into one entry per point, in INPUT order;
+    the transect set is split by output name using TRANSECT_POINTS.
+    """
+    points, tables = parse_input(input_file)
+    if not tables:
+        raise ValueError(f"No TABLE output requested in {input_file}")
+
+    base = os.path.dirname(os.path.abspath(input_file))
+    labels_file = os.path.join(base, TRANSECT_POINTS)
+    labels = {}
+    if os.path.exists(labels_file):
+        with open(labels_file) as f:
+            labels = {TRANSECT_SET: [p["output"] for p in json.load(f)]}
+
+    blocks, keys, coords, groups, transects = [], [], [], {}, []
+    columns = units = None
+    schedule = None
+
+    for table in tables:
+        names, table_units, data = read_table(os.path.join(base, table["file"]))
+        if columns is None:
+            columns, units = names, table_units
+            schedule = (table["start"], table["interval"])
+        elif names != columns:
+            raise ValueError(f"{table['file']} has columns {names}, expected {columns}")
+
+        set_coords = points.get(table["set"], [None])
+        npts = len(set_coords)
+        ntime = len(data) // npts
+        blocks.append(data[:ntime * npts].reshape(ntime, npts, len(names)))
+
+        first = len(keys)
+        set_labels = labels.get(table["set"])
+        if set_labels and len(set_labels) == npts:
+            counters = {}
+            for label in set_labels:
+                counters[label] = counters.get(label, 0) + 1
+                keys.append(f"{label}_{counters[label]}")
+            transects.extend(counters)
+            for label in counters:
+                idx = [first + i for i, l in enumerate(set_labels) if l == label]
+                groups[label] = slice(idx[0], idx[-1] + 1)
+        elif npts == 1:
+            keys.append(table["set"])
+        else:
+            keys.extend(f"{table['set']}_{i + 1}" for i in range(npts))
+        groups.setdefault(table["set"], slice(first, first + npts))
+        coords.extend(set_coords)
+
+    ntime = min(len(b) for b in blocks)
+    data = np.concatenate([b[:ntime] for b in blocks], axis=1)
+    start, interval = schedule
+    times = np.datetime64(start, "s") + (np.arange(ntime) * interval).astype("timedelta64[s]")
+    return SwanTables(times, keys, columns, units, data, coords, groups, transects)
@@ -0,0 +1,168 @@
+import os
+import subprocess
+import sys
+import time
+
+from swan_log import PRINT_FILE, PrintMonitor, rotate_print, save_run_metrics
+
+# Simulated seconds per wall-clock second below which a run is too slow
+MIN_THROUGHPUT = float(os.getenv("SWAN_MIN_THROUGHPUT", 60))
+# Do not judge throughput before SWAN has had time to set up the grid
+GRACE_SECONDS = float(os.getenv("SWAN_GRACE_SECONDS", 120))
+# Abort if the simulated clock has not moved for this long
+STALL_SECONDS = float(os.getenv("SWAN_STALL_SECONDS", 300))
+# Abort after this many consecutive time steps below the required accuracy
+# (stationary runs only: nonstationary PRINT files carry no accuracy lines)
+MAX_NON_CONVERGED = int(os.getenv("SWAN_MAX_NON_CONVERGED", 10))
+# Profile for the single retry after an abort ("" disables the retry)
+RETRY_PROFILE = os.getenv("SWAN_RETRY_PROFILE", "fast")
+RETRY_REASONS = ("stalled", "too slow")  # abort reasons a faster profile can help with
+
+REPORT_EVERY = 30
+
+
+class SwanWatchdog:
+    """
+    Runs SWAN as a child process and watches the PRINT file.
+    Exposes progress and ETA, and kills the run if it stalls,
+    falls below MIN_THROUGHPUT or, in stationary runs, stops converging.
+    """
+
+    def __init__(self, command, kill_command=None, print_file=PRINT_FILE,
+                 min_throughput=MIN_THROUGHPUT, grace=GRACE_SECONDS,
+                 stall=STALL_SECONDS, max_non_converged=MAX_NON_CONVERGED, poll=2.0):
+        self.command = command
+        self.kill_command = kill_command
+        self.min_throughput = min_throughput
+        self.grace = grace
+        self.stall = stall
+        self.max_non_converged = max_non_converged
+        self.poll = poll
+        self.monitor = PrintMonitor(print_file)
+        self.parser = self.monitor.parser
+        self.started = None
+        self._last_sim = 0.0
+        self._last_move = None
+
+    @property
+    def elapsed(self):
+        return time.time() - self.started if self.started else 0.0
+
+    @property
+    def throughput(self):
+        if self.elapsed <= 0:
+            return 0.0
+        return self.parser.sim_seconds / self.elapsed
+
+    @property
+    def eta(self):
+        """Remaining wall seconds, or None until progress has been seen."""
+        if not self.parser.total_seconds or self.throughput <= 0:
+            return None
+        return (self.parser.total_seconds - self.parser.sim_seconds) / self.throughput
+
+    def _non_converged_tail(self):
+        required = self.parser.required_accuracy
+        if required is None:
+            return 0
+        count = 0
+        for _, _, acc in reversed(self.parser.steps):
+            if acc is None or acc >= required:
+                break
+            count += 1
+        return count
+
+    def check(self):
+        """Return the reason to abort, or None while the run looks healthy."""
+        now = time.time()
+        if self.parser.sim_seconds != self._last_sim:
+            self._last_sim = self.parser.sim_seconds
+            self._last_move = now
+
+        if self.parser.errors:
+            return f"SWAN error: {next(iter(self.parser.errors))}"
+        if self._non_converged_tail() >= self.max_non_converged:
+            return f"not converging ({self.max_non_converged} steps below required accuracy)"
+        if now - self._last_move > self.stall:
+            return f"stalled (no progress for {self.stall:.0f}s)"
+        if self.elapsed > self.grace and self.throughput < self.min_throughput:
+            return f"too slow ({self.throughput:.1f} sim-s/s < {self.min_throughput:.1f})"
+        return None
+
+    def report(self):
+        eta = self.eta
+        eta_str = f"{eta / 60:.1f} min" if eta is not None else "unknown"
+        current = self.parser.current_time
+        current_str = current.strftime("%d-%b %H:%M") if current else "starting"
+        print(f"   SWAN {self.parser.progress * 100:5.1f}% ({current_str}) | "
+              f"{self.throughput:.0f} sim-s/s | ETA {eta_str}")
+
+    def kill(self, proc):
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        if self.kill_command:
+            # swan.exe may outlive its launcher (e.g. inside WSL)
+            subprocess.run(self.kill_command)
+
+    def run(self):
+        """Run SWAN to completion or abort. Returns (returncode, abort_reason)."""
+        self.monitor.start()
+        self.started = self._last_move = time.time()
+        proc = subprocess.Popen(self.command)
+        reason = None
+        last_report = self.started
+
+        try:
+            while proc.poll() is None:
+                time.sleep(self.poll)
+                reason = self.check()
+                if reason:
+                    self.kill(proc)
+                    break
+                if time.time() - last_report >= REPORT_EVERY:
+                    self.report()
+                    last_report = time.time()
+        except KeyboardInterrupt:
+            # Stop SWAN, then let Ctrl-C end the pipeline (no retry)
+            self.kill(proc)
+            raise
+        finally:
+            self.monitor.stop()
+
+        return proc.returncode, reason
+
+
+def run_watched(command, kill_command=None):
+    """One watched SWAN run with PRINT archived before and after."""
+    rotate_print()
+    watchdog = SwanWatchdog(command, kill_command=kill_command)
+    returncode, reason = watchdog.run()
+    record = save_run_metrics(watchdog.parser, watchdog.elapsed, returncode, reason)
+    print(f" SWAN metrics: {record['steps']} steps, {record['iterations_total']} iterations, "
+          f"{record['non_converged_steps']} non-converged, {sum(record['warnings'].values())} warnings")
+    rotate_print()
+    return returncode, reason
+
+
+def run_with_retry(command, kill_command=None, configure_script="04_configure_swan.py"):
+    """
+    Run SWAN under the watchdog. If the run stalled or was too slow, rewrite
+    INPUT with RETRY_PROFILE and try once more; a cheaper profile cannot fix
+    SWAN errors or divergence. Returns True on success.
+    """
+    returncode, reason = run_watched(command, kill_command)
+
+    if reason and reason.startswith(RETRY_REASONS) and RETRY_PROFILE:
+        print(f" SWAN aborted: {reason}. Retrying with '{RETRY_PROFILE}' profile...")
+        env = dict(os.environ, SWAN_PROFILE=RETRY_PROFILE)
+        subprocess.run([sys.executable, configure_script], env=env, check=True)
+        returncode, reason = run_watched(command, kill_command)
+
+    if reason:
+        print(f" SWAN aborted: {reason}.")
+        return False
+    return returncode == 0
@@ -0,0 +1,28 @@
+# Production serving profile: gunicorn -c gunicorn.conf.py wsgi:app
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+
+# Requests are short and mostly CPU (index lookups, JSON); a few threads per
+# worker cover the occasional database or file read
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then so slow leaks cannot build up
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 10000))
+max_requests_jitter = 1000
+
+# Not preloaded: each worker builds its own spot index and database pool
+# after the fork, so no connections are shared between processes
+preload_app = False
+
+raw_env = ["APP_CONFIG=" + os.getenv("APP_CONFIG", "app.config.ProductionConfig")]
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG")  # e.g. "-" for stdout
+errorlog = "-"
@@ -0,0 +1,40 @@
+"""Spot conditions summary
+
+Revision ID: a9d4f6b2e813
+Revises: f5b3e8a1c7d2
+Create Date: 2026-10-19 18:47:12.093316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a9d4f6b2e813'
+down_revision = 'f5b3e8a1c7d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'spot_conditions',
+        sa.Column('spot_id', sa.Integer(), nullable=False),
+        sa.Column('run_id', sa.String(length=64), nullable=True),
+        sa.Column('cycle_time', sa.DateTime(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+        sa.Column('now_time', sa.DateTime(), nullable=False),
+        sa.Column('now_surf_ft', sa.Float(), nullable=True),
+        sa.Column('now_quality', sa.String(length=20), nullable=True),
+        sa.Column('now_dir', sa.Float(), nullable=True),
+        sa.Column('now_tp', sa.Float(), nullable=True),
+        sa.Column('peak_time', sa.DateTime(), nullable=True),
+        sa.Column('peak_surf_ft', sa.Float(), nullable=True),
+        sa.Column('peak_quality', sa.String(length=20), nullable=True),
+        sa.Column('peak_tp', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['spot_id'], ['surf_spot.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('spot_id'),
+    )
+
+
+def downgrade():
+    op.drop_table('spot_conditions')
@@ -0,0 +1,62 @@
+"""Spatial index on surf_spot coordinates
+
+Revision ID: c3d9a1e5f2b7
+Revises: b64424f183ae
+Create Date: 2026-10-19 09:12:05.417332
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c3d9a1e5f2b7'
+down_revision = 'b64424f183ae'
+branch_labels = None
+depends_on = None
+
+# SQLite R*Tree kept in sync with surf_spot by triggers (see app/spatial.py)
+RTREE = 'surf_spot_rtree'
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        # earthdistance points are cubes; the GiST index serves ORDER BY <-> LIMIT k
+        op.execute('CREATE EXTENSION IF NOT EXISTS cube')
+        op.execute('CREATE EXTENSION IF NOT EXISTS earthdistance')
+        op.execute(
+            'CREATE INDEX ix_surf_spot_earth ON surf_spot '
+            'USING gist (ll_to_earth(latitude, longitude))'
+        )
+    elif dialect == 'sqlite':
+        op.execute(f'CREATE VIRTUAL TABLE {RTREE} USING rtree(id, min_lat, max_lat, min_lon, max_lon)')
+        op.execute(
+            f'INSERT INTO {RTREE} (id, min_lat, max_lat, min_lon, max_lon) '
+            'SELECT id, latitude, latitude, longitude, longitude FROM surf_spot'
+        )
+        op.execute(
+            f'CREATE TRIGGER {RTREE}_insert AFTER INSERT ON surf_spot BEGIN '
+            f'INSERT INTO {RTREE} VALUES (new.id, new.latitude, new.latitude, new.longitude, new.longitude); '
+            'END'
+        )
+        op.execute(
+            f'CREATE TRIGGER {RTREE}_update AFTER UPDATE OF id, latitude, longitude ON surf_spot BEGIN '
+            f'DELETE FROM {RTREE} WHERE id = old.id; '
+            f'INSERT INTO {RTREE} VALUES (new.id, new.latitude, new.latitude, new.longitude, new.longitude); '
+            'END'
+        )
+        op.execute(
+            f'CREATE TRIGGER {RTREE}_delete AFTER DELETE ON surf_spot BEGIN '
+            f'DELETE FROM {RTREE} WHERE id = old.id; '
+            'END'
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_surf_spot_earth')
+    elif dialect == 'sqlite':
+        for trigger in ('insert', 'update', 'delete'):
+            op.execute(f'DROP TRIGGER IF EXISTS {RTREE}_{trigger}')
+        op.execute(f'DROP TABLE IF EXISTS {RTREE}')
@@ -0,0 +1,25 @@
+"""Unique surf_spot name for upserts
+
+Revision ID: d81f4b2c6a90
+Revises: c3d9a1e5f2b7
+Create Date: 2026-10-19 11:40:27.905118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd81f4b2c6a90'
+down_revision = 'c3d9a1e5f2b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # A unique index rather than a batch-altered constraint: on SQLite a batch
+    # rebuild of surf_spot would drop the R*Tree triggers from c3d9a1e5f2b7
+    op.create_index('uq_surf_spot_name', 'surf_spot', ['name'], unique=True)
+
+
+def downgrade():
+    op.drop_index('uq_surf_spot_name', table_name='surf_spot')
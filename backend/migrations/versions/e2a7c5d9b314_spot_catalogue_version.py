@@ -0,0 +1,29 @@
+"""Spot catalogue version counter
+
+Revision ID: e2a7c5d9b314
+Revises: d81f4b2c6a90
+Create Date: 2026-10-19 14:05:51.280643
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e2a7c5d9b314'
+down_revision = 'd81f4b2c6a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    table = op.create_table(
+        'spot_catalogue_version',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.bulk_insert(table, [{'id': 1, 'version': 1}])
+
+
+def downgrade():
+    op.drop_table('spot_catalogue_version')
@@ -0,0 +1,43 @@
+"""Forecast point table
+
+Revision ID: f5b3e8a1c7d2
+Revises: e2a7c5d9b314
+Create Date: 2026-10-19 16:22:38.551904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f5b3e8a1c7d2'
+down_revision = 'e2a7c5d9b314'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'forecast_point',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('spot_id', sa.Integer(), nullable=False),
+        sa.Column('cycle_time', sa.DateTime(), nullable=False),
+        sa.Column('valid_time', sa.DateTime(), nullable=False),
+        sa.Column('run_id', sa.String(length=64), nullable=True),
+        sa.Column('surf_ft', sa.Float(), nullable=True),
+        sa.Column('quality', sa.String(length=20), nullable=True),
+        sa.Column('dir', sa.Float(), nullable=True),
+        sa.Column('tp', sa.Float(), nullable=True),
+        sa.Column('deep_hs', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['spot_id'], ['surf_spot.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    # Serves both "latest cycle for a spot" and the valid_time range scan within it
+    op.create_index(
+        'ix_forecast_point_spot_cycle_valid', 'forecast_point',
+        ['spot_id', 'cycle_time', 'valid_time'], unique=True,
+    )
+
+
+def downgrade():
+    op.drop_index('ix_forecast_point_spot_cycle_valid', table_name='forecast_point')
+    op.drop_table('forecast_point')
@@ -0,0 +1,86 @@
+"""
+Benchmark /closest-surf-spot lookups: the per-request query + haversine loop
+against the in-memory SpotIndex.
+
+    python scripts/bench_closest.py --spots 5000 --queries 2000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Private throwaway database so the benchmark never touches the app's own
+_tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp.name}"
+
+from app import create_app, db  # noqa: E402
+from app.models import SurfSpot  # noqa: E402
+from app.routes import haversine  # noqa: E402
+from app.spatial import spot_index  # noqa: E402
+
+
+def loop_closest(lat, lon):
+    # What the endpoint used to do on every request
+    closest, best = None, float("inf")
+    for spot in SurfSpot.query.all():
+        d = haversine(lat, lon, float(spot.latitude), float(spot.longitude))
+        if d < best:
+            closest, best = spot, d
+    return closest.name, best
+
+
+def index_closest(lat, lon):
+    spot, d = spot_index.nearest(lat, lon, k=1)[0]
+    return spot["name"], d
+
+
+def timed(fn, points):
+    start = time.perf_counter()
+    results = [fn(lat, lon) for lat, lon in points]
+    return (time.perf_counter() - start) / len(points) * 1000, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--spots", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        db.session.add_all(
+            SurfSpot(
+                name=f"spot-{i}", direction="South", type="Beach break", experience="All levels",
+                latitude=rng.uniform(-60, 60), longitude=rng.uniform(-180, 180),
+            )
+            for i in range(args.spots)
+        )
+        db.session.commit()
+
+        points = [(rng.uniform(-60, 60), rng.uniform(-180, 180)) for _ in range(args.queries)]
+        start = time.perf_counter()
+        spot_index.rebuild()
+        build_ms = (time.perf_counter() - start) * 1000
+
+        loop_ms, expected = timed(loop_closest, points)
+        index_ms, got = timed(index_closest, points)
+
+    mismatches = sum(a[0] != b[0] for a, b in zip(expected, got))
+    max_err = max(abs(a[1] - b[1]) for a, b in zip(expected, got))
+    print(f"{args.spots} spots, {args.queries} queries")
+    print(f"  index build      {build_ms:8.2f} ms")
+    print(f"  query + loop     {loop_ms:8.3f} ms/query")
+    print(f"  SpotIndex        {index_ms:8.3f} ms/query  ({loop_ms / index_ms:.0f}x)")
+    print(f"  mismatches {mismatches}, max distance difference {max_err:.2e} km")
+    os.unlink(_tmp.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Load test for /closest-surf-spot: throughput and p50/p99 latency.
+
+By default seeds a throwaway SQLite database (the assets CSV plus --spots
+synthetic spots), starts gunicorn with gunicorn.conf.py against it and
+drives it from --concurrency keep-alive client threads:
+
+    python scripts/load_test.py --workers 4 --concurrency 16 --requests 20000
+
+--database-url points the server at Postgres (or any URL) instead; it is
+migrated and seeded the same way. --url skips all setup and tests a
+server that is already running. Query points come from --seed, so runs
+are repeatable; --distinct sets how many different points are sent
+(fewer -> more geo-cache hits).
+"""
+import argparse
+import http.client
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def seed_database(database_url, spots, seed):
+    """Migrate `database_url` and upsert the assets CSV plus `spots` synthetic spots."""
+    os.environ["DATABASE_URL"] = database_url
+    from flask_migrate import upgrade
+
+    from app import create_app
+    from app.commands import DEFAULT_SPOTS_CSV, read_spots, upsert_spots
+
+    rng = random.Random(seed)
+    synthetic = (
+        {
+            "name": f"load-test spot {i}", "direction": "Left", "type": "Reef-rocky",
+            "experience": "All surfers", "latitude": rng.uniform(-60, 60), "longitude": rng.uniform(-180, 180),
+        }
+        for i in range(spots)
+    )
+    app = create_app()
+    with app.app_context():
+        upgrade(directory=os.path.join(BACKEND_DIR, "migrations"))
+        upsert_spots(read_spots(DEFAULT_SPOTS_CSV))
+        upsert_spots(synthetic)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(database_url, workers, threads):
+    port = free_port()
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        BIND=f"127.0.0.1:{port}",
+        WEB_CONCURRENCY=str(workers),
+        GUNICORN_THREADS=str(threads),
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/")
+            conn.getresponse().read()
+            return server, url
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise SystemExit("gunicorn did not start within 30 s")
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))]
+
+
+def run_load(url, paths, concurrency):
+    """Send every path once over `concurrency` keep-alive connections; returns (latencies_s, errors, elapsed_s)."""
+    parts = urlsplit(url)
+    latencies, errors = [], []
+    lock = threading.Lock()
+    queue = iter(paths)
+
+    def client():
+        conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        local, failed = [], 0
+        while True:
+            with lock:
+                path = next(queue, None)
+            if path is None:
+                break
+            start = time.perf_counter()
+            try:
+                conn.request("GET", path)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+            errors.append(failed)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, sum(errors), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="Test this running server instead of starting one")
+    parser.add_argument("--database-url", help="Database for the started server (default: temporary SQLite)")
+    parser.add_argument("--spots", type=int, default=1000, help="Synthetic spots added to the CSV ones")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers")
+    parser.add_argument("--threads", type=int, default=4, help="gunicorn threads per worker")
+    parser.add_argument("--concurrency", type=int, default=8, help="Client threads")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--distinct", type=int, default=1000, help="Distinct query points")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server, tmp = None, None
+    url = args.url
+    if not url:
+        database_url = args.database_url
+        if not database_url:
+            tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+            database_url = f"sqlite:///{tmp.name}"
+        seed_database(database_url, args.spots, args.seed)
+        server, url = start_server(database_url, args.workers, args.threads)
+
+    rng = random.Random(args.seed)
+    points = [(rng.uniform(5.8, 9.9), rng.uniform(79.6, 81.9)) for _ in range(args.distinct)]  # around Sri Lanka
+    paths = [
+        "/closest-surf-spot?latitude={:.5f}&longitude={:.5f}".format(*rng.choice(points))
+        for _ in range(args.warmup + args.requests)
+    ]
+    try:
+        run_load(url, paths[:args.warmup], args.concurrency)
+        latencies, errors, elapsed = run_load(url, paths[args.warmup:], args.concurrency)
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+        if tmp:
+            os.unlink(tmp.name)
+
+    ms = sorted(1000 * v for v in latencies)
+    print(f"{url}/closest-surf-spot  {len(ms)} requests, concurrency {args.concurrency}"
+          + ("" if args.url else f", {args.workers} workers x {args.threads} threads"))
+    print(f"  throughput  {len(ms) / elapsed:8.0f} req/s   errors {errors}")
+    print(f"  latency ms  p50 {percentile(ms, 50):.2f}  p90 {percentile(ms, 90):.2f}  "
+          f"p99 {percentile(ms, 99):.2f}  max {ms[-1]:.2f}")
+
+
+if __name__ == "__main__":
+    main()